@@ -1,10 +1,28 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
+import os
+import shutil
+import threading
 import time
 from pathlib import Path
 
+try:
+    import orjson
+
+    def _dumps(obj: dict) -> bytes:
+        return orjson.dumps(obj, default=str)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: dict) -> bytes:
+        return json.dumps(obj, default=str, separators=(",", ":"), ensure_ascii=False).encode()
+
+    _loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 # TTLs in seconds
@@ -12,101 +30,252 @@ CONFIRMED_TTL = 30 * 86400  # 30 days
 PENDING_TTL = 20             # 20 seconds
 NOT_FOUND_TTL = 30           # 30 seconds
 
+# Integer-nanosecond forms for st_mtime_ns comparisons
+_NS = 1_000_000_000
+CONFIRMED_TTL_NS = CONFIRMED_TTL * _NS
+PENDING_TTL_NS = PENDING_TTL * _NS
+NOT_FOUND_TTL_NS = NOT_FOUND_TTL * _NS
+
 DEFAULT_CACHE_DIR = Path(".cache/receipts")
+NEG_DIR = "neg"  # unsharded: entries live for seconds, so the directory stays small
+CAS_DIR = "cas"  # content-addressed image blobs, hard-linked from their logical keys
+
+_NEG_KEY_PREFIX = {chain: f"{NEG_DIR}/neg_{chain}_" for chain in ("base", "solana")}
+MEM_MAX_ENTRIES = 512  # in-process tier for hot summaries
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
 
 
 class FileCache:
+    """Best-effort receipt cache, one file per entry.
+
+    Writes are never fsynced: losing entries on a crash only costs a re-render.
+    """
+
     def __init__(self, cache_dir: Path | str | None = None):
         self._dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
         self._dir.mkdir(parents=True, exist_ok=True)
+        # key -> (value, expires_at); insertion order doubles as LRU order.
+        # Images are served straight from disk via sendfile and negative entries
+        # are short-lived, so only summaries live here.
+        self._mem: dict[str, tuple[dict, float]] = {}
+        # Writes land from BackgroundTask threads while reads run on the event loop
+        self._mem_lock = threading.Lock()
+
+    @staticmethod
+    def _shard(tx_hash: str) -> str:
+        """Two-level fan-out directory (``ab/cd``) from the hash's leading characters."""
+        h = tx_hash.removeprefix("0x").ljust(4, "_")
+        return f"{h[:2]}/{h[2:4]}"
 
     def _image_key(self, chain: str, tx_hash: str, template: str) -> str:
-        return f"receipt_{chain}_{tx_hash}_{template}.png"
+        return f"{self._shard(tx_hash)}/receipt_{chain}_{tx_hash}_{template}.png"
 
     def _summary_key(self, chain: str, tx_hash: str) -> str:
-        return f"receipt_{chain}_{tx_hash}.json"
+        return f"{self._shard(tx_hash)}/receipt_{chain}_{tx_hash}.json"
 
     def _negative_key(self, chain: str, tx_hash: str) -> str:
-        return f"neg_{chain}_{tx_hash}.txt"
+        prefix = _NEG_KEY_PREFIX.get(chain) or f"{NEG_DIR}/neg_{chain}_"
+        return prefix + tx_hash + ".txt"
 
     def _path(self, key: str) -> Path:
         return self._dir / key
 
-    def _is_expired(self, path: Path, ttl: float) -> bool:
-        if not path.exists():
+    def _is_expired(self, path: Path, ttl_ns: int) -> bool:
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
             return True
-        age = time.time() - path.stat().st_mtime
-        return age > ttl
+        return time.time_ns() - mtime_ns > ttl_ns
+
+    def _read_fresh(self, path: Path, ttl: float) -> tuple[bytes, float] | None:
+        """Read an entry with one stat + one read, unlinking it if older than ``ttl``.
+
+        Returns the bytes and the wall-clock time at which the entry expires.
+        """
+        try:
+            expires_at = path.stat().st_mtime + ttl
+            if time.time() > expires_at:
+                path.unlink(missing_ok=True)
+                return None
+            return path.read_bytes(), expires_at
+        except FileNotFoundError:
+            return None
+
+    def _mem_get(self, key: str) -> dict | None:
+        with self._mem_lock:
+            entry = self._mem.pop(key, None)
+            if entry is None or time.time() > entry[1]:
+                return None
+            self._mem[key] = entry
+        return entry[0]
+
+    def _mem_put(self, key: str, value: dict, expires_at: float) -> None:
+        with self._mem_lock:
+            self._mem.pop(key, None)
+            self._mem[key] = (value, expires_at)
+            while len(self._mem) > MEM_MAX_ENTRIES:
+                del self._mem[next(iter(self._mem))]
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        try:
+            fd = os.open(path, _WRITE_FLAGS, 0o644)
+        except FileNotFoundError:
+            # First write into this shard
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(path, _WRITE_FLAGS, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
 
     def get_image(self, chain: str, tx_hash: str, template: str) -> bytes | None:
+        loaded = self._read_fresh(self._path(self._image_key(chain, tx_hash, template)), CONFIRMED_TTL)
+        return loaded[0] if loaded else None
+
+    def get_image_path(self, chain: str, tx_hash: str, template: str) -> Path | None:
+        """Return the path of a fresh cached image without reading it, for FileResponse."""
         path = self._path(self._image_key(chain, tx_hash, template))
-        if not path.exists():
-            return None
-        if self._is_expired(path, CONFIRMED_TTL):
+        if self._is_expired(path, CONFIRMED_TTL_NS):
             path.unlink(missing_ok=True)
             return None
-        return path.read_bytes()
+        return path
 
     def set_image(self, chain: str, tx_hash: str, template: str, data: bytes) -> Path:
+        """Store the PNG once under cas/ and hard-link the logical entry to it.
+
+        Identical cards (the same placeholder for many txs, say) share one inode.
+        """
         path = self._path(self._image_key(chain, tx_hash, template))
-        path.write_bytes(data)
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        blob = self._path(f"{CAS_DIR}/{digest[:2]}/{digest[2:4]}/{digest}.png")
+        try:
+            os.utime(blob)  # already stored; refresh the TTL it shares with its links
+        except FileNotFoundError:
+            self._write(blob, data)
+
+        path.unlink(missing_ok=True)
+        try:
+            self._link(blob, path)
+        except OSError:
+            # No hard links here, or a concurrent writer linked path to a blob first.
+            # Swap in a private copy; writing through path could clobber that shared blob.
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            self._write(tmp, data)
+            os.replace(tmp, path)
         return path
 
+    @staticmethod
+    def _link(src: Path, dst: Path) -> None:
+        try:
+            os.link(src, dst)
+        except FileNotFoundError:
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            os.link(src, dst)
+
     def get_summary(self, chain: str, tx_hash: str) -> dict | None:
-        path = self._path(self._summary_key(chain, tx_hash))
-        if not path.exists():
-            return None
-        if self._is_expired(path, CONFIRMED_TTL):
-            path.unlink(missing_ok=True)
+        key = self._summary_key(chain, tx_hash)
+        if (summary := self._mem_get(key)) is not None:
+            return summary
+        path = self._path(key)
+        loaded = self._read_fresh(path, CONFIRMED_TTL)
+        if loaded is None:
             return None
+        raw, expires_at = loaded
         try:
-            return json.loads(path.read_text())
-        except (json.JSONDecodeError, OSError) as exc:
+            summary = _loads(raw)
+        except ValueError as exc:
             logger.warning("Corrupt cache file %s, removing: %s", path, exc)
             path.unlink(missing_ok=True)
             return None
+        self._mem_put(key, summary, expires_at)
+        return summary
 
     def set_summary(self, chain: str, tx_hash: str, summary: dict) -> Path:
-        path = self._path(self._summary_key(chain, tx_hash))
-        path.write_text(json.dumps(summary, default=str))
+        key = self._summary_key(chain, tx_hash)
+        path = self._path(key)
+        self._write(path, _dumps(summary))
+        self._mem_put(key, summary, time.time() + CONFIRMED_TTL)
         return path
 
+    def set_receipt(
+        self, chain: str, tx_hash: str, template: str, summary: dict, image: bytes | None = None
+    ) -> None:
+        """Store a rendered receipt's summary and, if given, its PNG in one call.
+
+        Lets the render paths schedule a single background task per request.
+        """
+        self.set_summary(chain, tx_hash, summary)
+        if image is not None:
+            self.set_image(chain, tx_hash, template, image)
+
     def get_negative(self, chain: str, tx_hash: str) -> str | None:
         path = self._path(self._negative_key(chain, tx_hash))
-        if not path.exists():
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            content = path.read_text().strip()
+        except FileNotFoundError:
             return None
-        content = path.read_text().strip()
-        ttl = PENDING_TTL if content == "pending" else NOT_FOUND_TTL
-        if self._is_expired(path, ttl):
+        ttl_ns = PENDING_TTL_NS if content == "pending" else NOT_FOUND_TTL_NS
+        if time.time_ns() - mtime_ns > ttl_ns:
             path.unlink(missing_ok=True)
             return None
         return content
 
     def set_negative(self, chain: str, tx_hash: str, state: str) -> None:
         path = self._path(self._negative_key(chain, tx_hash))
-        path.write_text(state)
+        self._write(path, state.encode())
+
+    # Negative entries are always a disk round-trip (no memory tier), so the
+    # request path uses these to keep that I/O off the event loop.
+    async def aget_negative(self, chain: str, tx_hash: str) -> str | None:
+        return await asyncio.to_thread(self.get_negative, chain, tx_hash)
+
+    async def aset_negative(self, chain: str, tx_hash: str, state: str) -> None:
+        await asyncio.to_thread(self.set_negative, chain, tx_hash, state)
 
     def clear(self) -> None:
-        for f in self._dir.iterdir():
-            if f.is_file():
-                f.unlink()
+        with self._mem_lock:
+            self._mem.clear()
+        shutil.rmtree(self._dir, ignore_errors=True)
+        self._dir.mkdir(parents=True, exist_ok=True)
 
-    def cleanup_expired(self) -> int:
+    def cleanup_expired(self, negative_only: bool = False) -> int:
+        """Unlink expired entries and return how many were removed.
+
+        ``negative_only`` sweeps just the short-lived negative entries, a single
+        small directory, so it can run far more often than a full sweep.
+        """
+        root = self._dir / NEG_DIR if negative_only else self._dir
+        now_ns = time.time_ns()
         removed = 0
-        for f in self._dir.iterdir():
-            if not f.is_file():
-                continue
-            name = f.name
-            if name.startswith("neg_"):
-                content = f.read_text().strip()
-                ttl = PENDING_TTL if content == "pending" else NOT_FOUND_TTL
-            elif name.endswith(".png") or name.endswith(".json"):
-                ttl = CONFIRMED_TTL
-            else:
+        stack = [os.fspath(root)]
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except FileNotFoundError:
                 continue
-            if self._is_expired(f, ttl):
-                f.unlink(missing_ok=True)
-                removed += 1
+            with it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    name = entry.name
+                    try:
+                        if name.startswith("neg_"):
+                            with open(entry.path) as f:
+                                content = f.read().strip()
+                            ttl_ns = PENDING_TTL_NS if content == "pending" else NOT_FOUND_TTL_NS
+                        elif name.endswith((".png", ".json")):
+                            ttl_ns = CONFIRMED_TTL_NS
+                        else:
+                            continue
+                        if now_ns - entry.stat(follow_symlinks=False).st_mtime_ns > ttl_ns:
+                            os.unlink(entry.path)
+                            removed += 1
+                    except FileNotFoundError:
+                        continue  # removed concurrently
         return removed
 
 
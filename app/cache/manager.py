@@ -1,5 +1,5 @@
 import time
-from collections import OrderedDict
+from typing import NamedTuple
 
 from app.models.transaction import NormalizedTransaction
 
@@ -7,38 +7,40 @@ DEFAULT_TTL = 300  # 5 minutes for confirmed txs
 PENDING_TTL = 15   # 15 seconds for pending txs
 NOT_FOUND_TTL = 30 # 30 seconds for not-found entries
 MAX_ENTRIES = 1000
+SVG_TTL = 300
+SVG_MAX_ENTRIES = 500
 
 _SENTINEL = object()
 
+# Module-level alias so tests can patch the clock without touching ``time``
+_now = time.monotonic
 
-class _CacheEntry:
-    __slots__ = ("data", "expires_at")
 
-    def __init__(self, data: NormalizedTransaction | None, ttl: float):
-        self.data = data
-        self.expires_at = time.monotonic() + ttl
+class _CacheEntry(NamedTuple):
+    data: NormalizedTransaction | None
+    expires_at: float
 
 
 class TransactionCache:
     def __init__(self, max_entries: int = MAX_ENTRIES):
-        self._store: OrderedDict[str, _CacheEntry] = OrderedDict()
+        # Plain dicts keep insertion order; re-inserting on hit moves a key to the
+        # MRU end, so the first key is always the LRU one.
+        self._store: dict[str, _CacheEntry] = {}
         self._max_entries = max_entries
 
     @staticmethod
     def _key(chain: str, tx_hash: str) -> str:
         return f"{chain}:{tx_hash}"
 
-    def get(self, chain: str, tx_hash: str) -> NormalizedTransaction | None | object:
+    def get(
+        self, chain: str, tx_hash: str, default: object = _SENTINEL
+    ) -> NormalizedTransaction | None | object:
         key = self._key(chain, tx_hash)
-        entry = self._store.get(key)
-        if entry is None:
-            return _SENTINEL
+        entry = self._store.pop(key, None)
+        if entry is None or _now() > entry.expires_at:
+            return default
 
-        if time.monotonic() > entry.expires_at:
-            del self._store[key]
-            return _SENTINEL
-
-        self._store.move_to_end(key)
+        self._store[key] = entry
         return entry.data
 
     def set(
@@ -58,13 +60,45 @@ class TransactionCache:
 
         key = self._key(chain, tx_hash)
 
-        if key in self._store:
-            del self._store[key]
+        self._store.pop(key, None)
+        self._store[key] = _CacheEntry(data, _now() + ttl)
+
+        while len(self._store) > self._max_entries:
+            del self._store[next(iter(self._store))]
+
+    def clear(self) -> None:
+        self._store.clear()
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+class SvgCache:
+    """LRU of rendered SVG cards keyed on (chain, tx_hash, template).
 
-        self._store[key] = _CacheEntry(data, ttl)
+    Only final (confirmed/failed) transactions are rendered, so a card for a
+    given key does not change while its entry is live.
+    """
 
+    def __init__(self, max_entries: int = SVG_MAX_ENTRIES, ttl: float = SVG_TTL):
+        self._store: dict[tuple[str, str, str], tuple[str, float]] = {}
+        self._max_entries = max_entries
+        self._ttl = ttl
+
+    def get(self, chain: str, tx_hash: str, template: str) -> str | None:
+        key = (chain, tx_hash, template)
+        entry = self._store.pop(key, None)
+        if entry is None or _now() > entry[1]:
+            return None
+        self._store[key] = entry
+        return entry[0]
+
+    def set(self, chain: str, tx_hash: str, template: str, svg: str) -> None:
+        key = (chain, tx_hash, template)
+        self._store.pop(key, None)
+        self._store[key] = (svg, _now() + self._ttl)
         while len(self._store) > self._max_entries:
-            self._store.popitem(last=False)
+            del self._store[next(iter(self._store))]
 
     def clear(self) -> None:
         self._store.clear()
@@ -74,4 +108,6 @@ class TransactionCache:
 
 
 CACHE_MISS = _SENTINEL
+# One cache per process: uvicorn workers and xdist test workers never share it
 tx_cache = TransactionCache()
+svg_cache = SvgCache()
@@ -83,6 +83,9 @@ def classify_evm_actions(raw_tx: dict) -> list[Action]:
         topics = log.get("topics", [])
         if not topics:
             continue
+        if isinstance(topics[0], bytes):
+            # Raw 32-byte topics (e.g. from a binary decoder) — compare as RPC hex
+            topics = ["0x" + t.hex() for t in topics]
 
         event_sig = topics[0].lower() if topics[0] else ""
         contract = (log.get("address") or "").lower()
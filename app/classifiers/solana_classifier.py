@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from app.models.action import Action, TokenInfo
+from app.utils.amounts import scale_integer
 
 VOTE_PROGRAM = "Vote111111111111111111111111111111111111111"
 
@@ -16,7 +17,9 @@ KNOWN_PROGRAMS: dict[str, str] = {
     "PhoeNiXZ8ByJGLkxNfZRnkUfjvmuYqLR89jjFHGqdXY": "Phoenix",
 }
 
-_DUST_THRESHOLD = 0.000001
+# Deltas at or below 1/_DUST_DIVISOR of a whole token are ignored
+_DUST_DIVISOR = 1_000_000
+_SOL_DECIMALS = 9
 
 
 def _get_pubkey(key) -> str:
@@ -57,6 +60,54 @@ def _identify_protocol(raw_tx: dict) -> str | None:
     return _find_program(raw_tx, KNOWN_PROGRAMS)
 
 
+def _balance_owner(entry: dict, account_keys: list) -> str:
+    """Owner of a balance entry that lacks ``"owner"``, via its account index."""
+    idx = entry.get("accountIndex", -1)
+    if 0 <= idx < len(account_keys):
+        return _get_pubkey(account_keys[idx])
+    return ""
+
+
+def _raw_amount(ui_amount: dict) -> int:
+    amount = ui_amount.get("amount")
+    if amount:
+        return int(amount)
+    # Fall back to the display value when the raw base-unit string is absent
+    return round(float(ui_amount.get("uiAmount") or 0) * 10 ** ui_amount.get("decimals", 0))
+
+
+def _signer_balances(
+    entries: list[dict], signer: str, account_keys: list, mint_decimals: dict[str, int]
+) -> dict[tuple[int, str], int]:
+    """The signer's raw token balances keyed by (account index, mint); records each mint's decimals."""
+    balances: dict[tuple[int, str], int] = {}
+    for entry in entries:
+        # jsonParsed balances carry "owner"; only older responses need the key lookup
+        owner = entry.get("owner") or _balance_owner(entry, account_keys)
+        if owner != signer:
+            continue
+        mint = entry.get("mint", "")
+        ui_amount = entry.get("uiTokenAmount", {})
+        balances[(entry.get("accountIndex", 0), mint)] = _raw_amount(ui_amount)
+        mint_decimals[mint] = ui_amount.get("decimals", 0)
+    return balances
+
+
+def _net_mint_deltas(
+    pre: dict[tuple[int, str], int], post: dict[tuple[int, str], int]
+) -> dict[str, int]:
+    """Net post-minus-pre change per mint in base units, summed over the signer's token accounts."""
+    deltas: dict[str, int] = {}
+    for key in pre.keys() | post.keys():
+        mint = key[1]
+        deltas[mint] = deltas.get(mint, 0) + post.get(key, 0) - pre.get(key, 0)
+    return deltas
+
+
+def _is_dust(raw: int, decimals: int) -> bool:
+    return abs(raw) * _DUST_DIVISOR <= 10 ** decimals
+
+
 def classify_solana_actions(raw_tx: dict) -> list[Action]:
     meta = raw_tx.get("meta", {})
     signer = _get_signer(raw_tx)
@@ -77,62 +128,25 @@ def classify_solana_actions(raw_tx: dict) -> list[Action]:
     pre_balances = meta.get("preTokenBalances", []) or []
     post_balances = meta.get("postTokenBalances", []) or []
 
-    pre_map: dict[tuple[int, str], float] = {}
-    post_map: dict[tuple[int, str], float] = {}
     mint_decimals: dict[str, int] = {}
     account_keys = _get_message(raw_tx).get("accountKeys", [])
-
-    def _get_owner(balance_entry: dict) -> str:
-        owner = balance_entry.get("owner", "")
-        if owner:
-            return owner
-        idx = balance_entry.get("accountIndex", -1)
-        if 0 <= idx < len(account_keys):
-            return _get_pubkey(account_keys[idx])
-        return ""
-
-    for entry in pre_balances:
-        if _get_owner(entry) != signer:
-            continue
-        mint = entry.get("mint", "")
-        ui_amount = entry.get("uiTokenAmount", {})
-        amount = float(ui_amount.get("uiAmount") or 0)
-        decimals = ui_amount.get("decimals", 0)
-        idx = entry.get("accountIndex", 0)
-        pre_map[(idx, mint)] = amount
-        mint_decimals[mint] = decimals
-
-    for entry in post_balances:
-        if _get_owner(entry) != signer:
-            continue
-        mint = entry.get("mint", "")
-        ui_amount = entry.get("uiTokenAmount", {})
-        amount = float(ui_amount.get("uiAmount") or 0)
-        decimals = ui_amount.get("decimals", 0)
-        idx = entry.get("accountIndex", 0)
-        post_map[(idx, mint)] = amount
-        mint_decimals[mint] = decimals
-
-    all_keys = set(pre_map.keys()) | set(post_map.keys())
-    mint_deltas: dict[str, float] = {}
-    for key in all_keys:
-        mint = key[1]
-        delta = post_map.get(key, 0.0) - pre_map.get(key, 0.0)
-        mint_deltas[mint] = mint_deltas.get(mint, 0.0) + delta
+    pre_map = _signer_balances(pre_balances, signer, account_keys, mint_decimals)
+    post_map = _signer_balances(post_balances, signer, account_keys, mint_decimals)
+    mint_deltas = _net_mint_deltas(pre_map, post_map)
 
     pre_sol_balances = meta.get("preBalances", [])
     post_sol_balances = meta.get("postBalances", [])
     fee = meta.get("fee", 0)
 
-    sol_delta = 0.0
+    sol_delta = 0
     if pre_sol_balances and post_sol_balances:
-        sol_delta = (post_sol_balances[0] - pre_sol_balances[0] + fee) / 1e9
+        sol_delta = post_sol_balances[0] - pre_sol_balances[0] + fee
 
     nft_actions: list[Action] = []
     nft_mints: set[str] = set()
     for mint, delta in list(mint_deltas.items()):
         decimals = mint_decimals.get(mint, 0)
-        if decimals == 0 and abs(round(delta)) == 1:
+        if decimals == 0 and abs(delta) == 1:
             nft_mints.add(mint)
             nft_actions.append(
                 Action(
@@ -153,29 +167,39 @@ def classify_solana_actions(raw_tx: dict) -> list[Action]:
         mint_deltas.pop(mint, None)
 
     NATIVE_KEY = "native_sol"
-    if abs(sol_delta) > _DUST_THRESHOLD:
+    if not _is_dust(sol_delta, _SOL_DECIMALS):
         mint_deltas[NATIVE_KEY] = sol_delta
+        mint_decimals[NATIVE_KEY] = _SOL_DECIMALS
+
+    significant = {
+        k: v for k, v in mint_deltas.items() if not _is_dust(v, mint_decimals.get(k, 0))
+    }
+    negative = {k: v for k, v in significant.items() if v < 0}
+    positive = {k: v for k, v in significant.items() if v > 0}
+
+    def ui_value(mint: str, raw: int) -> float:
+        return raw / 10 ** mint_decimals.get(mint, 0)
 
-    negative = {k: v for k, v in mint_deltas.items() if v < -_DUST_THRESHOLD}
-    positive = {k: v for k, v in mint_deltas.items() if v > _DUST_THRESHOLD}
+    def ui_amount(mint: str, raw: int) -> str:
+        return scale_integer(abs(raw), mint_decimals.get(mint, 0))
 
     actions: list[Action] = []
 
     if negative and positive:
-        token_in_mint = min(negative, key=negative.get)
-        token_out_mint = max(positive, key=positive.get)
+        token_in_mint = min(negative, key=lambda m: ui_value(m, negative[m]))
+        token_out_mint = max(positive, key=lambda m: ui_value(m, positive[m]))
 
         actions.append(
             Action(
                 type="swap",
                 token_in=TokenInfo(
                     address=token_in_mint if token_in_mint != NATIVE_KEY else "native",
-                    amount=str(abs(negative[token_in_mint])),
+                    amount=ui_amount(token_in_mint, negative[token_in_mint]),
                     decimals=mint_decimals.get(token_in_mint, 9),
                 ),
                 token_out=TokenInfo(
                     address=token_out_mint if token_out_mint != NATIVE_KEY else "native",
-                    amount=str(positive[token_out_mint]),
+                    amount=ui_amount(token_out_mint, positive[token_out_mint]),
                     decimals=mint_decimals.get(token_out_mint, 9),
                 ),
                 protocol=protocol,
@@ -188,7 +212,7 @@ def classify_solana_actions(raw_tx: dict) -> list[Action]:
                     type="transfer",
                     token_in=TokenInfo(
                         address=mint if mint != NATIVE_KEY else "native",
-                        amount=str(abs(delta)),
+                        amount=ui_amount(mint, delta),
                         decimals=mint_decimals.get(mint, 9),
                     ),
                     from_=signer,
@@ -202,7 +226,7 @@ def classify_solana_actions(raw_tx: dict) -> list[Action]:
                     type="transfer",
                     token_out=TokenInfo(
                         address=mint if mint != NATIVE_KEY else "native",
-                        amount=str(delta),
+                        amount=ui_amount(mint, delta),
                         decimals=mint_decimals.get(mint, 9),
                     ),
                     to=signer,
@@ -8,10 +8,9 @@ from fastapi import HTTPException
 logger = logging.getLogger(__name__)
 
 from app.config import settings
+from app.fetchers.client import RPC_TIMEOUT, get_client
 from app.models.transaction import FeeInfo, NormalizedTransaction
 
-RPC_TIMEOUT = 5.0
-
 
 def _rpc_payload(method: str, params: list, req_id: int = 1) -> dict:
     return {"jsonrpc": "2.0", "id": req_id, "method": method, "params": params}
@@ -21,15 +20,15 @@ async def fetch_base_transaction(tx_hash: str) -> NormalizedTransaction:
     url = settings.base_rpc_url
     logger.info("BASE RPC: fetching tx %s... from %s", tx_hash[:12], url.split("/v2")[0])
 
-    async with httpx.AsyncClient(timeout=RPC_TIMEOUT) as client:
-        try:
-            tx_resp, receipt_resp = await asyncio.gather(
-                client.post(url, json=_rpc_payload("eth_getTransactionByHash", [tx_hash], 1)),
-                client.post(url, json=_rpc_payload("eth_getTransactionReceipt", [tx_hash], 2)),
-            )
-        except httpx.TimeoutException:
-            logger.error("BASE RPC TIMEOUT for %s...", tx_hash[:12])
-            raise HTTPException(status_code=504, detail="RPC request timed out")
+    client = get_client()
+    try:
+        tx_resp, receipt_resp = await asyncio.gather(
+            client.post(url, json=_rpc_payload("eth_getTransactionByHash", [tx_hash], 1), timeout=RPC_TIMEOUT),
+            client.post(url, json=_rpc_payload("eth_getTransactionReceipt", [tx_hash], 2), timeout=RPC_TIMEOUT),
+        )
+    except httpx.TimeoutException:
+        logger.error("BASE RPC TIMEOUT for %s...", tx_hash[:12])
+        raise HTTPException(status_code=504, detail="RPC request timed out")
 
     logger.info("BASE RPC RESPONSE: tx_status=%s receipt_status=%s", tx_resp.status_code, receipt_resp.status_code)
     tx_json = tx_resp.json()
@@ -64,11 +63,11 @@ async def fetch_base_transaction(tx_hash: str) -> NormalizedTransaction:
     block_time = None
     if block_number_hex:
         try:
-            async with httpx.AsyncClient(timeout=RPC_TIMEOUT) as client:
-                block_resp = await client.post(
-                    url,
-                    json=_rpc_payload("eth_getBlockByNumber", [block_number_hex, False], 3),
-                )
+            block_resp = await client.post(
+                url,
+                json=_rpc_payload("eth_getBlockByNumber", [block_number_hex, False], 3),
+                timeout=RPC_TIMEOUT,
+            )
             block_data = block_resp.json().get("result")
             if block_data and block_data.get("timestamp"):
                 block_time = datetime.fromtimestamp(
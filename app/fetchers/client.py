@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import httpx
+
+RPC_TIMEOUT = 5.0
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Process-wide RPC client shared by the fetchers and the token resolver.
+
+    Callers pass their own ``timeout`` per request; the pool itself is shared.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=RPC_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
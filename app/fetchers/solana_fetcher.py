@@ -5,10 +5,10 @@ import httpx
 from fastapi import HTTPException
 
 from app.config import settings
+from app.fetchers.client import RPC_TIMEOUT, get_client
 from app.models.transaction import FeeInfo, NormalizedTransaction
 
 logger = logging.getLogger(__name__)
-RPC_TIMEOUT = 5.0
 
 
 async def fetch_solana_transaction(signature: str) -> NormalizedTransaction:
@@ -24,12 +24,11 @@ async def fetch_solana_transaction(signature: str) -> NormalizedTransaction:
         ],
     }
 
-    async with httpx.AsyncClient(timeout=RPC_TIMEOUT) as client:
-        try:
-            resp = await client.post(url, json=payload)
-        except httpx.TimeoutException:
-            logger.error("SOLANA RPC TIMEOUT for %s...", signature[:12])
-            raise HTTPException(status_code=504, detail="RPC request timed out")
+    try:
+        resp = await get_client().post(url, json=payload, timeout=RPC_TIMEOUT)
+    except httpx.TimeoutException:
+        logger.error("SOLANA RPC TIMEOUT for %s...", signature[:12])
+        raise HTTPException(status_code=504, detail="RPC request timed out")
 
     logger.info("SOLANA RPC RESPONSE: status=%s, body_len=%d", resp.status_code, len(resp.content))
     resp_json = resp.json()
@@ -1,19 +1,33 @@
+import hashlib
 import logging
 import re
+from contextlib import asynccontextmanager
 from typing import Optional
 
-import base58
-from fastapi import FastAPI, HTTPException, Query, Request
-from fastapi.responses import HTMLResponse, JSONResponse, Response
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Query, Request
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, Response
 from pydantic import BaseModel
 
 from app.cache.file_cache import file_cache
-from app.cache.manager import CACHE_MISS, tx_cache
+from app.cache.manager import CACHE_MISS, svg_cache, tx_cache
 from app.fetchers import fetch_transaction
+from app.fetchers.client import close_client
 from app.renderer.card import render_receipt_card
-from app.validation.input import validate_chain, validate_tx_hash
+from app.validation.input import b58decode, is_evm_tx_hash, validate_chain, validate_tx_hash
 
-EVM_TX_RE = re.compile(r"^0x[0-9a-fA-F]{64}$")
+try:
+    import orjson
+
+    class _SummaryResponse(JSONResponse):
+        """JSONResponse encoded with orjson (``speedups`` extra)."""
+
+        def render(self, content) -> bytes:
+            return orjson.dumps(content)
+except ImportError:
+    _SummaryResponse = JSONResponse
+
+VALID_TEMPLATES = frozenset({"classic", "minimal", "dark"})
+VALID_FORMATS = frozenset({"json", "svg", "png"})
 
 logging.basicConfig(
     level=logging.INFO,
@@ -21,7 +35,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger("app.main")
 
-app = FastAPI(title="Onchain Receipt Card API", version="0.2.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await close_client()
+
+
+app = FastAPI(title="Onchain Receipt Card API", version="0.2.0", lifespan=lifespan)
 
 
 @app.middleware("http")
@@ -105,7 +126,7 @@ async def receipt_info(chain: str):
 
 
 @app.post("/v1/receipt/{chain}")
-async def generate_receipt(chain: str, body: ReceiptRequest):
+async def generate_receipt(chain: str, body: ReceiptRequest, background_tasks: BackgroundTasks):
     logger.info("POST /v1/receipt/%s | raw body fields: tx_hash=%s, query=%s, prompt=%s, nested_body=%s, template=%s, format=%s",
                 chain, body.tx_hash, body.query, body.prompt, body.body, body.template, body.format)
 
@@ -124,24 +145,32 @@ async def generate_receipt(chain: str, body: ReceiptRequest):
 
     chain = validate_chain(chain)
     tx_hash = validate_tx_hash(chain, body.tx_hash)
-    template = body.template if body.template in ("classic", "minimal", "dark") else "classic"
-    fmt = body.format if body.format in ("json", "svg", "png") else "json"
+    template = body.template if body.template in VALID_TEMPLATES else "classic"
+    fmt = body.format if body.format in VALID_FORMATS else "json"
 
     logger.info("VALIDATED: chain=%s tx_hash=%s template=%s format=%s", chain, tx_hash, template, fmt)
 
     if fmt == "png":
-        cached_image = file_cache.get_image(chain, tx_hash, template)
-        if cached_image:
+        cached_path = file_cache.get_image_path(chain, tx_hash, template)
+        if cached_path:
             logger.info("CACHE HIT (png image) for %s/%s/%s", chain, tx_hash[:12], template)
-            return Response(content=cached_image, media_type="image/png")
+            return FileResponse(cached_path, media_type="image/png")
+
+    if fmt == "svg":
+        cached_svg = svg_cache.get(chain, tx_hash, template)
+        if cached_svg is not None:
+            logger.info("CACHE HIT (svg) for %s/%s/%s", chain, tx_hash[:12], template)
+            return Response(content=cached_svg, media_type="image/svg+xml")
 
     if fmt == "json":
+        # The cached summary is already a JSON-ready dict; serve it without
+        # rebuilding NormalizedTransaction or re-rendering
         cached_summary = file_cache.get_summary(chain, tx_hash)
         if cached_summary:
             logger.info("CACHE HIT (json summary) for %s/%s", chain, tx_hash[:12])
             return _json_response(cached_summary, cached=True)
 
-    neg = file_cache.get_negative(chain, tx_hash)
+    neg = await file_cache.aget_negative(chain, tx_hash)
     if neg == "pending":
         logger.info("NEGATIVE CACHE: pending for %s/%s", chain, tx_hash[:12])
         raise HTTPException(status_code=202, detail="Transaction pending confirmation. Try again shortly.")
@@ -159,12 +188,12 @@ async def generate_receipt(chain: str, body: ReceiptRequest):
 
     if tx_data is None:
         logger.warning("RPC returned None for %s/%s", chain, tx_hash[:12])
-        file_cache.set_negative(chain, tx_hash, "not_found")
+        await file_cache.aset_negative(chain, tx_hash, "not_found")
         raise HTTPException(status_code=404, detail="Transaction not found")
 
     if tx_data.status == "pending":
         logger.info("Transaction pending: %s/%s", chain, tx_hash[:12])
-        file_cache.set_negative(chain, tx_hash, "pending")
+        await file_cache.aset_negative(chain, tx_hash, "pending")
         if fmt == "json":
             return JSONResponse(
                 content={"status": "pending", "detail": "Transaction pending confirmation. Try again shortly."},
@@ -176,12 +205,12 @@ async def generate_receipt(chain: str, body: ReceiptRequest):
     tx_dict = tx_data.model_dump(mode="json")
     card_data, summary = await render_receipt_card(tx_dict, template=template, format=fmt)
 
-    file_cache.set_summary(chain, tx_hash, summary)
-
-    if fmt == "png" and isinstance(card_data, bytes):
-        file_cache.set_image(chain, tx_hash, template, card_data)
+    # Cache writes run after the response is sent, off the request's critical path
+    image = card_data if fmt == "png" and isinstance(card_data, bytes) else None
+    background_tasks.add_task(file_cache.set_receipt, chain, tx_hash, template, summary, image)
 
     if fmt == "svg":
+        svg_cache.set(chain, tx_hash, template, card_data)
         return Response(content=card_data, media_type="image/svg+xml")
     elif fmt == "png":
         return Response(content=card_data, media_type="image/png")
@@ -190,7 +219,7 @@ async def generate_receipt(chain: str, body: ReceiptRequest):
 
 
 def _json_response(summary: dict, cached: bool) -> JSONResponse:
-    return JSONResponse(content={
+    return _SummaryResponse(content={
         "summary": summary,
         "card": {
             "format": "json",
@@ -201,32 +230,15 @@ def _json_response(summary: dict, cached: bool) -> JSONResponse:
     })
 
 
-@app.get("/receipt/{chain}/{tx_hash}", response_class=HTMLResponse)
-async def receipt_page(chain: str, tx_hash: str):
-    try:
-        chain = validate_chain(chain)
-        tx_hash = validate_tx_hash(chain, tx_hash)
-    except HTTPException:
-        return HTMLResponse(content=_error_html("Invalid chain or transaction hash"), status_code=400)
-
-    summary = file_cache.get_summary(chain, tx_hash)
-
-    if summary:
-        title = _build_og_title(summary)
-    else:
-        title = f"Transaction on {chain.title()}"
-
-    image_url = f"/v1/receipt/{chain}/card/{tx_hash}/classic.png"
-
-    html = f"""<!DOCTYPE html>
+_OG_PAGE_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{_escape_html(title)}</title>
+    <title>{title}</title>
 
     <!-- Open Graph -->
-    <meta property="og:title" content="{_escape_html(title)}" />
+    <meta property="og:title" content="{title}" />
     <meta property="og:description" content="Onchain receipt powered by APIX402" />
     <meta property="og:image" content="{image_url}" />
     <meta property="og:image:width" content="1200" />
@@ -235,52 +247,97 @@ async def receipt_page(chain: str, tx_hash: str):
 
     <!-- Twitter -->
     <meta name="twitter:card" content="summary_large_image" />
-    <meta name="twitter:title" content="{_escape_html(title)}" />
+    <meta name="twitter:title" content="{title}" />
     <meta name="twitter:description" content="Onchain receipt powered by APIX402" />
     <meta name="twitter:image" content="{image_url}" />
 
     <style>
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
             background: #0D1117; color: #E6EDF3; margin: 0; padding: 40px 20px;
             display: flex; flex-direction: column; align-items: center; min-height: 100vh;
-        }}
-        .card {{ max-width: 640px; width: 100%; }}
-        .card img {{ width: 100%; border-radius: 12px; box-shadow: 0 8px 32px rgba(0,0,0,0.3); }}
-        h1 {{ font-size: 20px; margin: 24px 0 8px; }}
-        .meta {{ color: #8B949E; font-size: 14px; }}
-        a {{ color: #58A6FF; text-decoration: none; }}
-        a:hover {{ text-decoration: underline; }}
-        .cta {{ margin-top: 32px; padding: 12px 24px; background: #238636; color: white;
-                border-radius: 8px; font-weight: bold; display: inline-block; }}
+        }
+        .card { max-width: 640px; width: 100%; }
+        .card img { width: 100%; border-radius: 12px; box-shadow: 0 8px 32px rgba(0,0,0,0.3); }
+        h1 { font-size: 20px; margin: 24px 0 8px; }
+        .meta { color: #8B949E; font-size: 14px; }
+        a { color: #58A6FF; text-decoration: none; }
+        a:hover { text-decoration: underline; }
+        .cta { margin-top: 32px; padding: 12px 24px; background: #238636; color: white;
+                border-radius: 8px; font-weight: bold; display: inline-block; }
     </style>
 </head>
 <body>
     <div class="card">
         <img src="{image_url}" alt="Onchain Receipt" />
-        <h1>{_escape_html(title)}</h1>
-        <p class="meta">{chain.title()} &middot; {_escape_html(tx_hash[:10])}...{_escape_html(tx_hash[-6:])}</p>
+        <h1>{title}</h1>
+        <p class="meta">{chain} &middot; {tx_short}</p>
         <a class="cta" href="https://apix402.com">Powered by APIX402 &rarr;</a>
     </div>
 </body>
 </html>"""
 
-    return HTMLResponse(content=html)
+# Split once at import: even indices are static text, odd indices are field names
+_OG_PAGE_PARTS = re.split(r"\{(\w+)\}", _OG_PAGE_TEMPLATE)
+# Keying ETags on the template means a template change invalidates them on deploy
+_OG_ETAG_KEY = hashlib.blake2b(_OG_PAGE_TEMPLATE.encode()).digest()
+
+
+def _og_etag(chain: str, tx_hash: str, title: str) -> str:
+    digest = hashlib.blake2b(f"{chain}\0{tx_hash}\0{title}".encode(), digest_size=8, key=_OG_ETAG_KEY)
+    return f'"{digest.hexdigest()}"'
+
+
+def _render_og_page(**fields: str) -> str:
+    return "".join([fields[part] if i % 2 else part for i, part in enumerate(_OG_PAGE_PARTS)])
+
+
+@app.get("/receipt/{chain}/{tx_hash}", response_class=HTMLResponse)
+async def receipt_page(chain: str, tx_hash: str, request: Request):
+    try:
+        chain = validate_chain(chain)
+        tx_hash = validate_tx_hash(chain, tx_hash)
+    except HTTPException:
+        return HTMLResponse(content=_error_html("Invalid chain or transaction hash"), status_code=400)
+
+    summary = file_cache.get_summary(chain, tx_hash)
+
+    if summary:
+        title = _build_og_title(summary)
+    else:
+        title = f"Transaction on {chain.title()}"
+
+    # The page is a pure function of (chain, tx_hash, title), so crawlers
+    # revalidating an unchanged page get a bodiless 304 before any assembly
+    etag = _og_etag(chain, tx_hash, title)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    image_url = f"/v1/receipt/{chain}/card/{tx_hash}/classic.png"
+
+    html = _render_og_page(
+        title=_escape_html(title),
+        image_url=image_url,
+        chain=chain.title(),
+        tx_short=f"{_escape_html(tx_hash[:10])}...{_escape_html(tx_hash[-6:])}",
+    )
+
+    return HTMLResponse(content=html, headers={"ETag": etag})
 
 
 @app.get("/v1/receipt/{chain}/card/{tx_hash}/{template}.png")
-async def receipt_card_image(chain: str, tx_hash: str, template: str):
+async def receipt_card_image(chain: str, tx_hash: str, template: str, background_tasks: BackgroundTasks):
     try:
         chain = validate_chain(chain)
         tx_hash = validate_tx_hash(chain, tx_hash)
     except HTTPException:
         raise HTTPException(status_code=400, detail="Invalid chain or transaction hash")
 
-    template = template if template in ("classic", "minimal", "dark") else "classic"
+    template = template if template in VALID_TEMPLATES else "classic"
 
-    cached_image = file_cache.get_image(chain, tx_hash, template)
-    if cached_image:
-        return Response(content=cached_image, media_type="image/png")
+    cached_path = file_cache.get_image_path(chain, tx_hash, template)
+    if cached_path:
+        return FileResponse(cached_path, media_type="image/png")
 
     tx_data = tx_cache.get(chain, tx_hash)
     if tx_data is CACHE_MISS:
@@ -293,18 +350,17 @@ async def receipt_card_image(chain: str, tx_hash: str, template: str):
     tx_dict = tx_data.model_dump(mode="json")
     card_data, summary = await render_receipt_card(tx_dict, template=template, format="png")
 
-    file_cache.set_summary(chain, tx_hash, summary)
-    file_cache.set_image(chain, tx_hash, template, card_data)
+    background_tasks.add_task(file_cache.set_receipt, chain, tx_hash, template, summary, card_data)
 
     return Response(content=card_data, media_type="image/png")
 
 
 def _detect_chain(tx_hash: str) -> str:
     """Auto-detect chain from tx hash format."""
-    if EVM_TX_RE.match(tx_hash):
+    if is_evm_tx_hash(tx_hash):
         return "base"
     try:
-        decoded = base58.b58decode(tx_hash)
+        decoded = b58decode(tx_hash.encode())
         if len(decoded) == 64:
             return "solana"
     except Exception:
@@ -313,17 +369,19 @@ def _detect_chain(tx_hash: str) -> str:
 
 
 @app.get("/{tx_hash}")
-async def short_image_route(tx_hash: str, template: str = Query(default="classic")):
+async def short_image_route(
+    tx_hash: str, background_tasks: BackgroundTasks, template: str = Query(default="classic")
+):
     """Short-path image route for APIX: /{tx_hash}?template=dark"""
     logger.info("SHORT PATH: /%s?template=%s", tx_hash[:16], template)
     chain = _detect_chain(tx_hash)
     validate_tx_hash(chain, tx_hash)
-    template = template if template in ("classic", "minimal", "dark") else "classic"
+    template = template if template in VALID_TEMPLATES else "classic"
 
-    cached_image = file_cache.get_image(chain, tx_hash, template)
-    if cached_image:
+    cached_path = file_cache.get_image_path(chain, tx_hash, template)
+    if cached_path:
         logger.info("SHORT PATH CACHE HIT for %s/%s/%s", chain, tx_hash[:12], template)
-        return Response(content=cached_image, media_type="image/png")
+        return FileResponse(cached_path, media_type="image/png")
 
     tx_data = tx_cache.get(chain, tx_hash)
     if tx_data is CACHE_MISS:
@@ -337,8 +395,7 @@ async def short_image_route(tx_hash: str, template: str = Query(default="classic
     tx_dict = tx_data.model_dump(mode="json")
     card_data, summary = await render_receipt_card(tx_dict, template=template, format="png")
 
-    file_cache.set_summary(chain, tx_hash, summary)
-    file_cache.set_image(chain, tx_hash, template, card_data)
+    background_tasks.add_task(file_cache.set_receipt, chain, tx_hash, template, summary, card_data)
 
     logger.info("SHORT PATH: rendered and cached %s/%s/%s", chain, tx_hash[:12], template)
     return Response(content=card_data, media_type="image/png")
@@ -0,0 +1,8 @@
+from __future__ import annotations
+
+
+def _truncate_address(address: str | None) -> str:
+    # Full-length addresses and hashes are the common case, so test for them first
+    if address and len(address) > 12:
+        return f"{address[:6]}...{address[-4:]}"
+    return address or ""
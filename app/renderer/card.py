@@ -3,6 +3,7 @@ from __future__ import annotations
 from app.classifiers import normalize_actions
 from app.models.action import Action
 from app.renderer.svg_builder import render_receipt_svg
+from app.utils.amounts import POW10, scale_integer
 from app.validation.sanitize import sanitize_action
 
 
@@ -28,8 +29,12 @@ def _apply_decimals(action: Action, chain: str) -> Action:
 
     for token in (action.token_in, action.token_out):
         if token and token.decimals:
-            raw = float(token.amount)
-            token.amount = str(raw / (10 ** token.decimals))
+            amount = token.amount
+            if 0 < token.decimals < len(POW10) and amount.isascii() and amount.isdigit():
+                token.amount = scale_integer(int(amount), token.decimals)
+            else:
+                raw = float(amount)
+                token.amount = str(raw / (10 ** token.decimals))
 
     return action
 
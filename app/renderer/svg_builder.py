@@ -1,87 +1,149 @@
 from __future__ import annotations
 
 import hashlib
+import re
 from datetime import datetime
+from functools import lru_cache
+from typing import Callable, NamedTuple
 
 from app.models.action import Action
+from app.renderer._util import _truncate_address
 from app.renderer.templates import (
     ACTION_ICONS,
     CHAIN_COLORS,
     STATUS_COLORS,
     TEMPLATES,
+    TemplateColors,
 )
 
 WIDTH = 1200
 HEIGHT = 630
 
+_COLORED_ICONS: dict[tuple[str, str], str] = {
+    (action_type, color): icon_path.replace("{color}", color)
+    for action_type, icon_path in ACTION_ICONS.items()
+    for color in {*CHAIN_COLORS.values(), *(t.accent for t in TEMPLATES.values())}
+}
 
-def _escape_xml(text: str) -> str:
-    return (
-        text.replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-        .replace('"', "&quot;")
-        .replace("'", "&apos;")
-    )
 
+_XML_ESCAPES = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&apos;",
+})
 
-def _truncate_address(address: str) -> str:
-    if not address or len(address) <= 12:
-        return address or ""
-    return f"{address[:6]}...{address[-4:]}"
 
+_XML_SPECIAL = frozenset("&<>\"'")
 
+
+def _escape_xml(text: str) -> str:
+    if not text:
+        return ""
+    # Most symbols, names and addresses need no escaping; skip the copy for them
+    if _XML_SPECIAL.isdisjoint(text):
+        return text
+    return text.translate(_XML_ESCAPES)
+
+
+@lru_cache(maxsize=4096)
 def _token_color(address: str) -> str:
-    h = hashlib.md5(address.encode()).hexdigest()
-    r = int(h[0:2], 16)
-    g = int(h[2:4], 16)
-    b = int(h[4:6], 16)
-    r = 80 + (r % 176)
-    g = 80 + (g % 176)
-    b = 80 + (b % 176)
-    return f"#{r:02x}{g:02x}{b:02x}"
+    # Popular tokens (stablecoins, native assets) recur on nearly every card
+    r, g, b = hashlib.md5(address.encode()).digest()[:3]
+    return f"#{80 + r % 176:02x}{80 + g % 176:02x}{80 + b % 176:02x}"
+
+
+def _fmt_swap(action: Action) -> tuple[str, str]:
+    in_sym = action.token_in.symbol if action.token_in else "?"
+    in_amt = action.token_in.amount if action.token_in else "?"
+    out_sym = action.token_out.symbol if action.token_out else "?"
+    out_amt = action.token_out.amount if action.token_out else "?"
+    return "Swapped", f"{_format_amount(in_amt)} {in_sym}  →  {_format_amount(out_amt)} {out_sym}"
+
+
+def _fmt_transfer(action: Action) -> tuple[str, str]:
+    if action.token_in:
+        return "Sent", f"{_format_amount(action.token_in.amount)} {action.token_in.symbol}"
+    if action.token_out:
+        return "Received", f"{_format_amount(action.token_out.amount)} {action.token_out.symbol}"
+    return "Transfer", ""
+
+
+def _fmt_nft_transfer(action: Action) -> tuple[str, str]:
+    nft_label = f"NFT #{action.nft.token_id}" if action.nft and action.nft.token_id else "NFT"
+    if action.token_in:
+        return "Sent NFT", nft_label
+    return "Received NFT", nft_label
+
+
+_ACTION_FORMATTERS: dict[str, Callable[[Action], tuple[str, str]]] = {
+    "swap": _fmt_swap,
+    "transfer": _fmt_transfer,
+    "nft_transfer": _fmt_nft_transfer,
+    "approve": lambda a: ("Approved", f"Spender: {_truncate_address(a.spender or '')}"),
+    "mint": lambda a: ("Minted", ""),
+    "burn": lambda a: ("Burned", ""),
+    "contract_call": lambda a: ("Contract Call", a.note or ""),
+    "overflow": lambda a: ("", a.note or ""),
+}
 
 
 def _format_action_text(action: Action) -> tuple[str, str]:
-    if action.type == "swap":
-        in_sym = action.token_in.symbol if action.token_in else "?"
-        in_amt = action.token_in.amount if action.token_in else "?"
-        out_sym = action.token_out.symbol if action.token_out else "?"
-        out_amt = action.token_out.amount if action.token_out else "?"
-        return "Swapped", f"{_format_amount(in_amt)} {in_sym}  →  {_format_amount(out_amt)} {out_sym}"
-    elif action.type == "transfer":
-        if action.token_in:
-            sym = action.token_in.symbol
-            amt = action.token_in.amount
-            return "Sent", f"{_format_amount(amt)} {sym}"
-        elif action.token_out:
-            sym = action.token_out.symbol
-            amt = action.token_out.amount
-            return "Received", f"{_format_amount(amt)} {sym}"
-        return "Transfer", ""
-    elif action.type == "nft_transfer":
-        nft_label = ""
-        if action.nft and action.nft.token_id:
-            nft_label = f"NFT #{action.nft.token_id}"
-        else:
-            nft_label = "NFT"
-        if action.token_in:
-            return "Sent NFT", nft_label
-        return "Received NFT", nft_label
-    elif action.type == "approve":
-        return "Approved", f"Spender: {_truncate_address(action.spender or '')}"
-    elif action.type == "mint":
-        return "Minted", ""
-    elif action.type == "burn":
-        return "Burned", ""
-    elif action.type == "contract_call":
-        return "Contract Call", action.note or ""
-    elif action.type == "overflow":
-        return "", action.note or ""
-    return action.type.title(), ""
+    formatter = _ACTION_FORMATTERS.get(action.type)
+    if formatter is None:
+        return action.type.title(), ""
+    return formatter(action)
+
+
+# float() round-trips any 15-significant-digit decimal, so only longer strings
+# need the exact integer-significand path below
+_FLOAT_SAFE_LEN = 16
+
+
+def _round_scaled(mant: int, frac_digits: int, places: int) -> int:
+    """Round ``mant / 10**frac_digits`` half-up to ``places`` decimals, scaled by 10**places."""
+    if frac_digits <= places:
+        return mant * 10 ** (places - frac_digits)
+    drop = 10 ** (frac_digits - places)
+    return (mant + drop // 2) // drop
+
+
+def _format_fixed(mant: int, frac_digits: int, places: int, grouping: bool) -> str:
+    whole, frac = divmod(_round_scaled(mant, frac_digits, places), 10 ** places)
+    whole_text = f"{whole:,}" if grouping else str(whole)
+    if not places:
+        return whole_text
+    return f"{whole_text}.{frac:0{places}d}".rstrip("0").rstrip(".")
+
+
+def _format_exact(whole: str, frac: str) -> str:
+    mant = int(whole + frac)
+    scale = 10 ** len(frac)
+    if mant == 0:
+        return "0"
+    if mant >= 1_000_000 * scale:
+        return _format_fixed(mant, len(frac), 0, grouping=True)
+    if mant >= scale:
+        return _format_fixed(mant, len(frac), 4, grouping=True)
+    if mant * 10_000 >= scale:
+        return _format_fixed(mant, len(frac), 6, grouping=False)
+    return _format_fixed(mant, len(frac), 10, grouping=False)
 
 
 def _format_amount(raw: str) -> str:
+    if not raw:
+        return raw
+    if raw.isascii() and raw.isdigit():
+        # Whole amounts need no rounding: group the digits straight from int
+        return f"{int(raw):,}"
+    if len(raw) > _FLOAT_SAFE_LEN:
+        # Long raw token amounts (18-decimal wei values and the like) lose digits
+        # through float; format them from the exact integer significand instead
+        whole, dot, frac = raw.partition(".")
+        if raw.isascii() and whole.isdigit() and (frac.isdigit() or not dot):
+            return _format_exact(whole, frac)
+
     try:
         val = float(raw)
     except (ValueError, TypeError):
@@ -116,19 +178,141 @@ def _render_token_circle(x: int, y: int, symbol: str, address: str, radius: int
 
 
 def _render_action_icon(x: int, y: int, action_type: str, color: str) -> str:
-    icon_path = ACTION_ICONS.get(action_type, ACTION_ICONS["contract_call"])
-    colored_path = icon_path.replace("{color}", color)
+    colored_path = _COLORED_ICONS.get((action_type, color))
+    if colored_path is None:
+        icon_path = ACTION_ICONS.get(action_type, ACTION_ICONS["contract_call"])
+        colored_path = icon_path.replace("{color}", color)
     return f'<g transform="translate({x},{y}) scale(1.2)">{colored_path}</g>'
 
 
+@lru_cache(maxsize=16)
+def _style_block(template: str, chain_color: str) -> str:
+    colors = TEMPLATES[template]
+    return f"""<defs>
+  <style>
+    .title {{ font-family: Arial, Helvetica, sans-serif; font-size: 22px; font-weight: bold; fill: {colors.text_primary}; }}
+    .label {{ font-family: Arial, Helvetica, sans-serif; font-size: 16px; fill: {colors.text_secondary}; }}
+    .value {{ font-family: 'Courier New', Courier, monospace; font-size: 16px; fill: {colors.text_primary}; }}
+    .action-label {{ font-family: Arial, Helvetica, sans-serif; font-size: 28px; font-weight: bold; fill: {colors.text_primary}; }}
+    .action-detail {{ font-family: 'Courier New', Courier, monospace; font-size: 22px; fill: {colors.text_primary}; }}
+    .protocol {{ font-family: Arial, Helvetica, sans-serif; font-size: 16px; fill: {colors.text_secondary}; }}
+    .footer {{ font-family: Arial, Helvetica, sans-serif; font-size: 13px; fill: {colors.text_secondary}; }}
+    .chain-label {{ font-family: Arial, Helvetica, sans-serif; font-size: 14px; font-weight: bold; fill: {chain_color}; text-transform: uppercase; letter-spacing: 2px; }}
+  </style>
+</defs>"""
+
+
+class _CardStyle(NamedTuple):
+    colors: TemplateColors
+    chain_color: str
+    style_block: str
+    chain_initial: str
+    chain_label: str
+
+
+def _card_style(chain: str, template: str) -> _CardStyle:
+    colors = TEMPLATES[template]
+    chain_color = CHAIN_COLORS.get(chain, colors.accent)
+    return _CardStyle(
+        colors,
+        chain_color,
+        _style_block(template, chain_color),
+        _escape_xml(chain[0].upper()),
+        _escape_xml(chain.upper()),
+    )
+
+
+# Every known (chain, template) pair resolved once at import
+_CARD_STYLES: dict[tuple[str, str], _CardStyle] = {
+    (chain, template): _card_style(chain, template)
+    for chain in CHAIN_COLORS
+    for template in TEMPLATES
+}
+
+_Y_ACTION = 140
+_Y_TOKENS = _Y_ACTION + 96
+_Y_DETAILS = 380
+_Y_FOOTER = HEIGHT - 75
+
+# Card layout with the geometry baked in at import; ``{name}`` slots are filled
+# per render. Split once into alternating literals and slot names.
+_SVG_TEMPLATE = f"""<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {WIDTH} {HEIGHT}" width="{WIDTH}" height="{HEIGHT}">
+{{style}}
+
+<!-- Background -->
+<rect width="{WIDTH}" height="{HEIGHT}" rx="16" fill="{{background}}"/>
+<rect x="1" y="1" width="{WIDTH - 2}" height="{HEIGHT - 2}" rx="15" fill="none" stroke="{{border}}" stroke-width="1"/>
+
+<!-- Header -->
+<circle cx="60" cy="52" r="18" fill="{{chain_color}}"/>
+<text x="60" y="58" text-anchor="middle" fill="white" font-size="14" font-weight="bold" font-family="Arial">{{chain_initial}}</text>
+<text x="90" y="48" class="chain-label">{{chain_label}}</text>
+<text x="90" y="66" class="title">ONCHAIN RECEIPT</text>
+
+<!-- Status -->
+<rect x="{WIDTH - 200}" y="32" width="160" height="36" rx="18" fill="{{status_color}}" opacity="0.15"/>
+<circle cx="{WIDTH - 180}" cy="50" r="5" fill="{{status_color}}"/>
+<text x="{WIDTH - 166}" y="55" font-family="Arial, Helvetica, sans-serif" font-size="14" font-weight="bold" fill="{{status_color}}">{{status_label}}</text>
+
+<line x1="40" y1="90" x2="{WIDTH - 40}" y2="90" stroke="{{divider}}" stroke-width="1"/>
+
+{{action_icon}}
+<text x="85" y="{_Y_ACTION}" class="action-label">{{action_label}}</text>
+<text x="85" y="{_Y_ACTION + 36}" class="action-detail">{{action_detail}}</text>
+
+{{protocol_line}}{{token_circles}}<!-- Details -->
+<line x1="40" y1="{_Y_DETAILS - 20}" x2="{WIDTH - 40}" y2="{_Y_DETAILS - 20}" stroke="{{divider}}" stroke-width="1"/>
+<text x="60" y="{_Y_DETAILS + 10}" class="label">From</text>
+<text x="160" y="{_Y_DETAILS + 10}" class="value">{{from_addr}}</text>
+
+<text x="60" y="{_Y_DETAILS + 40}" class="label">Fee</text>
+<text x="160" y="{_Y_DETAILS + 40}" class="value">{{fee_text}}</text>
+
+<text x="400" y="{_Y_DETAILS + 10}" class="label">Tx</text>
+<text x="440" y="{_Y_DETAILS + 10}" class="value">{{tx_short}}</text>
+
+<line x1="40" y1="{_Y_FOOTER - 10}" x2="{WIDTH - 40}" y2="{_Y_FOOTER - 10}" stroke="{{divider}}" stroke-width="1"/>
+<text x="60" y="{_Y_FOOTER + 16}" class="label">{{block_text}}  ·  {{block_time_text}}</text>
+
+<text x="{WIDTH // 2}" y="{HEIGHT - 20}" text-anchor="middle" class="footer">powered by APIX402</text>
+
+</svg>"""
+_SVG_PARTS = re.split(r"\{(\w+)\}", _SVG_TEMPLATE)
+
+
+def _render_svg(**fields: str) -> str:
+    return "".join([fields[part] if i % 2 else part for i, part in enumerate(_SVG_PARTS)])
+
+
 def render_receipt_svg(
     normalized_tx: dict,
     actions: list[Action],
     template: str = "classic",
 ) -> str:
-    colors = TEMPLATES.get(template, TEMPLATES["classic"])
+    if template not in TEMPLATES:
+        template = "classic"
+    return _render_card(normalized_tx, actions, template)
+
+
+def render_receipts_svg(
+    normalized_txs: list[dict],
+    actions_list: list[list[Action]],
+    template: str = "classic",
+) -> list[str]:
+    """Render a batch of cards that share one template, resolving it once."""
+    if template not in TEMPLATES:
+        template = "classic"
+    return [
+        _render_card(normalized_tx, actions, template)
+        for normalized_tx, actions in zip(normalized_txs, actions_list, strict=True)
+    ]
+
+
+def _render_card(normalized_tx: dict, actions: list[Action], template: str) -> str:
     chain = normalized_tx.get("chain", "base")
-    chain_color = CHAIN_COLORS.get(chain, colors.accent)
+    card_style = _CARD_STYLES.get((chain, template)) or _card_style(chain, template)
+    colors = card_style.colors
+    chain_color = card_style.chain_color
 
     status = normalized_tx.get("status", "confirmed")
     status_color = STATUS_COLORS.get(status, "#6B7280")
@@ -146,92 +330,44 @@ def render_receipt_svg(
     primary_action = actions[0] if actions else Action(type="contract_call", primary=True)
     action_label, action_detail = _format_action_text(primary_action)
 
-    parts: list[str] = []
-
-    parts.append(f"""<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {WIDTH} {HEIGHT}" width="{WIDTH}" height="{HEIGHT}">
-<defs>
-  <style>
-    .title {{ font-family: Arial, Helvetica, sans-serif; font-size: 22px; font-weight: bold; fill: {colors.text_primary}; }}
-    .label {{ font-family: Arial, Helvetica, sans-serif; font-size: 16px; fill: {colors.text_secondary}; }}
-    .value {{ font-family: 'Courier New', Courier, monospace; font-size: 16px; fill: {colors.text_primary}; }}
-    .action-label {{ font-family: Arial, Helvetica, sans-serif; font-size: 28px; font-weight: bold; fill: {colors.text_primary}; }}
-    .action-detail {{ font-family: 'Courier New', Courier, monospace; font-size: 22px; fill: {colors.text_primary}; }}
-    .protocol {{ font-family: Arial, Helvetica, sans-serif; font-size: 16px; fill: {colors.text_secondary}; }}
-    .footer {{ font-family: Arial, Helvetica, sans-serif; font-size: 13px; fill: {colors.text_secondary}; }}
-    .chain-label {{ font-family: Arial, Helvetica, sans-serif; font-size: 14px; font-weight: bold; fill: {chain_color}; text-transform: uppercase; letter-spacing: 2px; }}
-  </style>
-</defs>
-
-<!-- Background -->
-<rect width="{WIDTH}" height="{HEIGHT}" rx="16" fill="{colors.background}"/>
-<rect x="1" y="1" width="{WIDTH - 2}" height="{HEIGHT - 2}" rx="15" fill="none" stroke="{colors.border}" stroke-width="1"/>
-""")
-
-    parts.append(f"""<!-- Header -->
-<circle cx="60" cy="52" r="18" fill="{chain_color}"/>
-<text x="60" y="58" text-anchor="middle" fill="white" font-size="14" font-weight="bold" font-family="Arial">{_escape_xml(chain[0].upper())}</text>
-<text x="90" y="48" class="chain-label">{_escape_xml(chain.upper())}</text>
-<text x="90" y="66" class="title">ONCHAIN RECEIPT</text>
-""")
-
-    parts.append(f"""<!-- Status -->
-<rect x="{WIDTH - 200}" y="32" width="160" height="36" rx="18" fill="{status_color}" opacity="0.15"/>
-<circle cx="{WIDTH - 180}" cy="50" r="5" fill="{status_color}"/>
-<text x="{WIDTH - 166}" y="55" font-family="Arial, Helvetica, sans-serif" font-size="14" font-weight="bold" fill="{status_color}">{status_label}</text>
-""")
-
-    parts.append(f"""<line x1="40" y1="90" x2="{WIDTH - 40}" y2="90" stroke="{colors.divider}" stroke-width="1"/>
-""")
-
-    y_action = 140
-    parts.append(_render_action_icon(44, y_action - 16, primary_action.type, chain_color))
-
-    parts.append(f"""<text x="85" y="{y_action}" class="action-label">{_escape_xml(action_label)}</text>
-<text x="85" y="{y_action + 36}" class="action-detail">{_escape_xml(action_detail)}</text>
-""")
-
     protocol_text = primary_action.protocol or ""
-    if protocol_text:
-        parts.append(f"""<text x="85" y="{y_action + 64}" class="protocol">via {_escape_xml(protocol_text)}</text>
-""")
+    protocol_line = (
+        f'<text x="85" y="{_Y_ACTION + 64}" class="protocol">via {_escape_xml(protocol_text)}</text>\n\n'
+        if protocol_text
+        else ""
+    )
 
-    y_tokens = y_action + 96
     token_circles = []
     if primary_action.token_in:
         token_circles.append(
-            _render_token_circle(65, y_tokens, primary_action.token_in.symbol, primary_action.token_in.address)
+            _render_token_circle(65, _Y_TOKENS, primary_action.token_in.symbol, primary_action.token_in.address)
         )
     if primary_action.token_out:
         offset = 110 if primary_action.token_in else 0
         token_circles.append(
-            _render_token_circle(65 + offset, y_tokens, primary_action.token_out.symbol, primary_action.token_out.address)
+            _render_token_circle(65 + offset, _Y_TOKENS, primary_action.token_out.symbol, primary_action.token_out.address)
         )
     if primary_action.token_in and primary_action.token_out:
-        token_circles.insert(1, f'<text x="110" y="{y_tokens + 6}" font-size="20" fill="{colors.text_secondary}" font-family="Arial">→</text>')
-
-    parts.extend(token_circles)
-
-    y_details = 380
-    parts.append(f"""<!-- Details -->
-<line x1="40" y1="{y_details - 20}" x2="{WIDTH - 40}" y2="{y_details - 20}" stroke="{colors.divider}" stroke-width="1"/>
-<text x="60" y="{y_details + 10}" class="label">From</text>
-<text x="160" y="{y_details + 10}" class="value">{_escape_xml(from_addr)}</text>
-
-<text x="60" y="{y_details + 40}" class="label">Fee</text>
-<text x="160" y="{y_details + 40}" class="value">{_escape_xml(fee_text)}</text>
-
-<text x="400" y="{y_details + 10}" class="label">Tx</text>
-<text x="440" y="{y_details + 10}" class="value">{_escape_xml(_truncate_address(tx_hash))}</text>
-""")
-
-    y_footer = HEIGHT - 75
-    parts.append(f"""<line x1="40" y1="{y_footer - 10}" x2="{WIDTH - 40}" y2="{y_footer - 10}" stroke="{colors.divider}" stroke-width="1"/>
-<text x="60" y="{y_footer + 16}" class="label">{_escape_xml(block_text)}  ·  {_escape_xml(block_time_text)}</text>
-""")
-
-    parts.append(f"""<text x="{WIDTH // 2}" y="{HEIGHT - 20}" text-anchor="middle" class="footer">powered by APIX402</text>
-""")
-
-    parts.append("</svg>")
-
-    return "\n".join(parts)
+        token_circles.insert(1, f'<text x="110" y="{_Y_TOKENS + 6}" font-size="20" fill="{colors.text_secondary}" font-family="Arial">→</text>')
+
+    return _render_svg(
+        style=card_style.style_block,
+        background=colors.background,
+        border=colors.border,
+        divider=colors.divider,
+        chain_color=chain_color,
+        chain_initial=card_style.chain_initial,
+        chain_label=card_style.chain_label,
+        status_color=status_color,
+        status_label=status_label,
+        action_icon=_render_action_icon(44, _Y_ACTION - 16, primary_action.type, chain_color),
+        action_label=_escape_xml(action_label),
+        action_detail=_escape_xml(action_detail),
+        protocol_line=protocol_line,
+        token_circles="".join(f"{fragment}\n" for fragment in token_circles),
+        from_addr=_escape_xml(from_addr),
+        fee_text=_escape_xml(fee_text),
+        tx_short=_escape_xml(_truncate_address(tx_hash)),
+        block_text=_escape_xml(block_text),
+        block_time_text=_escape_xml(block_time_text),
+    )
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import logging
+from functools import lru_cache
 from pathlib import Path
 
 import httpx
@@ -9,10 +10,13 @@ import httpx
 logger = logging.getLogger(__name__)
 
 from app.config import settings
+from app.fetchers.client import get_client
+from app.renderer._util import _truncate_address
 
 _REGISTRY_PATH = Path(__file__).parent / "registry.json"
 _registry: dict[str, dict[str, dict]] = {}
-_cache: dict[str, dict] = {}  # permanent in-memory cache for on-chain lookups
+# Permanent in-memory cache for on-chain lookups, keyed (chain, normalized address)
+_cache: dict[tuple[str, str], dict] = {}
 
 ONCHAIN_TIMEOUT = 0.2
 
@@ -21,32 +25,26 @@ def _load_registry() -> dict[str, dict[str, dict]]:
     global _registry
     if not _registry:
         with open(_REGISTRY_PATH) as f:
-            _registry = json.load(f)
+            _registry = {
+                chain: {k.lower(): v for k, v in tokens.items()} if chain == "base" else tokens
+                for chain, tokens in json.load(f).items()
+            }
     return _registry
 
 
-def _truncate_address(address: str) -> str:
-    if len(address) > 12:
-        return f"{address[:6]}...{address[-4:]}"
-    return address
+@lru_cache(maxsize=4096)
+def _addr_key(chain: str, address: str) -> str:
+    return address.lower() if chain == "base" else address
 
 
 def _lookup_local(chain: str, address: str) -> dict | None:
-    registry = _load_registry()
-    chain_registry = registry.get(chain, {})
-    addr_key = address.lower() if chain == "base" else address
-
-    if addr_key in chain_registry:
-        return chain_registry[addr_key]
-
-    cache_key = f"{chain}:{addr_key}"
-    if cache_key in _cache:
-        return _cache[cache_key]
-
-    return None
+    addr_key = _addr_key(chain, address)
+    return _load_registry().get(chain, {}).get(addr_key) or _cache.get((chain, addr_key))
 
 
+@lru_cache(maxsize=1024)
 def _fallback(chain: str, address: str) -> dict:
+    # Shared like registry entries: callers only read the returned metadata
     return {
         "symbol": _truncate_address(address),
         "name": "Unknown Token",
@@ -63,8 +61,8 @@ async def resolve_token(chain: str, address: str) -> dict:
     if local:
         return local
 
-    addr_key = address.lower() if chain == "base" else address
-    cache_key = f"{chain}:{addr_key}"
+    addr_key = _addr_key(chain, address)
+    cache_key = (chain, addr_key)
 
     result = None
     if chain == "base":
@@ -89,17 +87,22 @@ async def _fetch_evm_token_metadata(address: str) -> dict | None:
         {"method": "eth_call", "params": [{"to": address, "data": "0x313ce567"}, "latest"], "id": 3},  # decimals()
     ]
 
+    # One JSON-RPC batch instead of three sequential round-trips
+    payload = [{"jsonrpc": "2.0", **call} for call in calls]
     try:
-        async with httpx.AsyncClient(timeout=ONCHAIN_TIMEOUT) as client:
-            responses = []
-            for call in calls:
-                payload = {"jsonrpc": "2.0", **call}
-                resp = await client.post(url, json=payload)
-                responses.append(resp.json())
+        resp = await get_client().post(url, json=payload, timeout=ONCHAIN_TIMEOUT)
+        batch = resp.json()
     except (httpx.TimeoutException, httpx.HTTPError) as exc:
         logger.debug("EVM token metadata fetch failed for %s: %s", address, exc)
         return None
 
+    if not isinstance(batch, list):
+        logger.debug("EVM token metadata batch rejected for %s: %s", address, batch)
+        return None
+    # Batch replies may come back in any order
+    by_id = {item.get("id"): item for item in batch if isinstance(item, dict)}
+    responses = [by_id.get(call["id"], {}) for call in calls]
+
     try:
         symbol = _decode_string_result(responses[0].get("result", "0x"))
         name = _decode_string_result(responses[1].get("result", "0x"))
@@ -120,12 +123,15 @@ def _decode_string_result(hex_data: str) -> str:
         return ""
     try:
         data = bytes.fromhex(hex_data[2:])
-        if len(data) < 64:
+        # Head word is the offset of the string's length word (almost always 0x20)
+        offset = int.from_bytes(data[:32], "big")
+        if offset + 32 > len(data):
             return ""
-        length = int.from_bytes(data[32:64], "big")
+        start = offset + 32
+        length = int.from_bytes(data[offset:start], "big")
         if length == 0 or length > 256:
             return ""
-        return data[64 : 64 + length].decode("utf-8", errors="replace").strip("\x00")
+        return data[start : start + length].decode("utf-8", errors="replace").strip("\x00")
     except (ValueError, UnicodeDecodeError):
         return ""
 
@@ -141,8 +147,7 @@ async def _fetch_solana_token_metadata(mint: str) -> dict | None:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=ONCHAIN_TIMEOUT) as client:
-            resp = await client.post(url, json=payload)
+        resp = await get_client().post(url, json=payload, timeout=ONCHAIN_TIMEOUT)
     except (httpx.TimeoutException, httpx.HTTPError) as exc:
         logger.debug("Solana token metadata fetch failed for %s: %s", mint, exc)
         return None
@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+POW10 = tuple(10 ** i for i in range(37))
+
+
+def scale_integer(amount: int, decimals: int) -> str:
+    """Exact ``amount / 10**decimals`` for a non-negative integer, keeping float's ``"1.0"`` shape."""
+    scale = POW10[decimals] if decimals < len(POW10) else 10 ** decimals
+    whole, frac = divmod(amount, scale)
+    return f"{whole}.{str(frac).zfill(decimals).rstrip('0') or '0'}"
@@ -1,14 +1,34 @@
-import re
-
-import base58
 from fastapi import HTTPException
 
-SUPPORTED_CHAINS = {"base", "solana"}
-EVM_TX_HASH_RE = re.compile(r"^0x[0-9a-fA-F]{64}$")
+try:
+    from based58 import b58decode
+except ImportError:
+    from base58 import b58decode
+
+SUPPORTED_CHAINS = frozenset({"base", "solana"})
+
+# A 64-byte signature encodes to at most 88 base58 chars; leading zero bytes
+# shorten it down to one "1" per byte, so anything outside 64..88 can't decode
+# to 64 bytes.
+SOLANA_SIG_MIN_LEN = 64
+SOLANA_SIG_MAX_LEN = 88
+
+
+def is_evm_tx_hash(tx_hash: str) -> bool:
+    """``0x`` followed by exactly 64 hex digits, checked by the C hex decoder."""
+    if len(tx_hash) != 66 or not tx_hash.startswith("0x"):
+        return False
+    try:
+        # fromhex skips whitespace, so the byte count is what rules it out
+        return len(bytes.fromhex(tx_hash[2:])) == 32
+    except ValueError:
+        return False
 
 
 def validate_chain(chain: str) -> str:
-    chain = chain.lower().strip()
+    if chain in SUPPORTED_CHAINS:
+        return chain  # already canonical, the usual case for path params
+    chain = chain.strip().lower()
     if chain not in SUPPORTED_CHAINS:
         raise HTTPException(
             status_code=400,
@@ -21,14 +41,19 @@ def validate_tx_hash(chain: str, tx_hash: str) -> str:
     tx_hash = tx_hash.strip()
 
     if chain == "base":
-        if not EVM_TX_HASH_RE.match(tx_hash):
+        if not is_evm_tx_hash(tx_hash):
             raise HTTPException(
                 status_code=400,
                 detail="Invalid Base tx hash. Expected 66-char hex string starting with 0x.",
             )
     elif chain == "solana":
+        if not SOLANA_SIG_MIN_LEN <= len(tx_hash) <= SOLANA_SIG_MAX_LEN:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid Solana signature. Expected 64 bytes, got {len(tx_hash)} base58 chars.",
+            )
         try:
-            decoded = base58.b58decode(tx_hash)
+            decoded = b58decode(tx_hash.encode())
         except ValueError:
             raise HTTPException(
                 status_code=400,
@@ -7,27 +7,34 @@ MAX_ADDRESS_LEN = 66
 MAX_PROTOCOL_LEN = 50
 MAX_NOTE_LEN = 100
 
+# Prebuilt slices: indexing with a constant slice skips BUILD_SLICE per call
+_SYMBOL_SLICE = slice(MAX_SYMBOL_LEN)
+_ADDRESS_SLICE = slice(MAX_ADDRESS_LEN)
+_PROTOCOL_SLICE = slice(MAX_PROTOCOL_LEN)
+_NOTE_SLICE = slice(MAX_NOTE_LEN)
+
 # Token symbols: alphanumeric + limited special chars
-_SYMBOL_RE = re.compile(r"^[a-zA-Z0-9_.\-#/ ]+$")
+_SYMBOL_RE = re.compile(r"[a-zA-Z0-9_.\-#/ ]+")
+_SYMBOL_STRIP = str.maketrans("", "", "<>&")
 
 
 def sanitize_symbol(symbol: str) -> str:
-    symbol = symbol.strip()[:MAX_SYMBOL_LEN]
-    if not symbol or not _SYMBOL_RE.match(symbol):
-        return symbol[:MAX_SYMBOL_LEN].replace("<", "").replace(">", "").replace("&", "") or "?"
+    symbol = symbol.strip()[_SYMBOL_SLICE]
+    if not symbol or not _SYMBOL_RE.fullmatch(symbol):
+        return symbol.translate(_SYMBOL_STRIP) or "?"
     return symbol
 
 
 def sanitize_address(address: str) -> str:
-    return address.strip()[:MAX_ADDRESS_LEN]
+    return address.strip()[_ADDRESS_SLICE]
 
 
 def sanitize_protocol(name: str) -> str:
-    return name.strip()[:MAX_PROTOCOL_LEN]
+    return name.strip()[_PROTOCOL_SLICE]
 
 
 def sanitize_note(note: str) -> str:
-    return note.strip()[:MAX_NOTE_LEN]
+    return note.strip()[_NOTE_SLICE]
 
 
 _FIELD_SANITIZERS = {
@@ -46,14 +53,13 @@ _TOKEN_FIELD_SANITIZERS = {
 
 def sanitize_action(action_dict: dict) -> dict:
     for token_key in ("token_in", "token_out"):
-        token = action_dict.get(token_key)
-        if token:
+        if token := action_dict.get(token_key):
             for field, fn in _TOKEN_FIELD_SANITIZERS.items():
-                if field in token:
-                    token[field] = fn(token[field])
+                if (val := token.get(field)) is not None:
+                    token[field] = fn(val)
 
     for field, fn in _FIELD_SANITIZERS.items():
-        if action_dict.get(field):
-            action_dict[field] = fn(action_dict[field])
+        if val := action_dict.get(field):
+            action_dict[field] = fn(val)
 
     return action_dict
@@ -0,0 +1,22 @@
+"""Shared helpers for building EVM log fixtures."""
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _pad_address(addr: str) -> str:
+    """Pad address to 32 bytes for event topics."""
+    return "0x" + addr[2:].zfill(64)
+
+
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+TRANSFER_TOPIC_B = bytes.fromhex(TRANSFER_TOPIC[2:])
+
+
+def _transfer_log(addr: str, frm: str, to: str, amount: int) -> dict:
+    """Build an ERC20 Transfer log moving ``amount`` of ``addr`` from ``frm`` to ``to``."""
+    return {
+        "address": addr,
+        "topics": (TRANSFER_TOPIC, _pad_address(frm), _pad_address(to)),
+        "data": hex(amount),
+    }
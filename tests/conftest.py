@@ -1,16 +1,30 @@
+import json
+from collections.abc import Mapping
+from types import MappingProxyType
+
+import httpx
 import pytest
 
-from app.cache.manager import tx_cache
+from app.cache.manager import svg_cache, tx_cache
 
 
 @pytest.fixture(autouse=True)
 def clear_cache():
-    tx_cache.clear()
+    """Reset the process-wide tx_cache and svg_cache around each test.
+
+    xdist runs each worker in its own process, so this is all the isolation
+    ``pytest -n auto`` needs.
+    """
+    for cache in (tx_cache, svg_cache):
+        if len(cache):
+            cache.clear()
     yield
-    tx_cache.clear()
+    for cache in (tx_cache, svg_cache):
+        if len(cache):
+            cache.clear()
 
 
-MOCK_BASE_TX = {
+MOCK_BASE_TX = MappingProxyType({
     "jsonrpc": "2.0",
     "id": 1,
     "result": {
@@ -22,9 +36,9 @@ MOCK_BASE_TX = {
         "blockNumber": "0x1",
         "type": "0x2",
     },
-}
+})
 
-MOCK_BASE_RECEIPT = {
+MOCK_BASE_RECEIPT = MappingProxyType({
     "jsonrpc": "2.0",
     "id": 2,
     "result": {
@@ -36,20 +50,20 @@ MOCK_BASE_RECEIPT = {
         "effectiveGasPrice": "0x3b9aca00",  # 1 gwei
         "logs": [],
     },
-}
+})
 
-MOCK_BASE_BLOCK = {
+MOCK_BASE_BLOCK = MappingProxyType({
     "jsonrpc": "2.0",
     "id": 3,
     "result": {
         "timestamp": "0x65b0c800",  # 2024-01-24T00:00:00Z
     },
-}
+})
 
-MOCK_BASE_TX_NULL = {"jsonrpc": "2.0", "id": 1, "result": None}
-MOCK_BASE_RECEIPT_NULL = {"jsonrpc": "2.0", "id": 2, "result": None}
+MOCK_BASE_TX_NULL = MappingProxyType({"jsonrpc": "2.0", "id": 1, "result": None})
+MOCK_BASE_RECEIPT_NULL = MappingProxyType({"jsonrpc": "2.0", "id": 2, "result": None})
 
-MOCK_BASE_RECEIPT_FAILED = {
+MOCK_BASE_RECEIPT_FAILED = MappingProxyType({
     "jsonrpc": "2.0",
     "id": 2,
     "result": {
@@ -61,7 +75,30 @@ MOCK_BASE_RECEIPT_FAILED = {
         "effectiveGasPrice": "0x3b9aca00",
         "logs": [],
     },
-}
+})
+
+JSON_HEADERS = {"content-type": "application/json"}
+
+
+def _json_bytes(payload: Mapping) -> bytes:
+    return json.dumps(dict(payload)).encode()
+
+
+# Pre-serialized bodies so respx-mocked responses don't re-encode per test
+MOCK_BASE_TX_BYTES = _json_bytes(MOCK_BASE_TX)
+MOCK_BASE_RECEIPT_BYTES = _json_bytes(MOCK_BASE_RECEIPT)
+MOCK_BASE_BLOCK_BYTES = _json_bytes(MOCK_BASE_BLOCK)
+MOCK_BASE_TX_NULL_BYTES = _json_bytes(MOCK_BASE_TX_NULL)
+MOCK_BASE_RECEIPT_NULL_BYTES = _json_bytes(MOCK_BASE_RECEIPT_NULL)
+MOCK_BASE_RECEIPT_FAILED_BYTES = _json_bytes(MOCK_BASE_RECEIPT_FAILED)
+
+# Ready-made responses; respx streams the byte body, so one instance serves many requests
+RESP_BASE_TX = httpx.Response(200, content=MOCK_BASE_TX_BYTES, headers=JSON_HEADERS)
+RESP_BASE_RECEIPT = httpx.Response(200, content=MOCK_BASE_RECEIPT_BYTES, headers=JSON_HEADERS)
+RESP_BASE_BLOCK = httpx.Response(200, content=MOCK_BASE_BLOCK_BYTES, headers=JSON_HEADERS)
+RESP_BASE_TX_NULL = httpx.Response(200, content=MOCK_BASE_TX_NULL_BYTES, headers=JSON_HEADERS)
+RESP_BASE_RECEIPT_NULL = httpx.Response(200, content=MOCK_BASE_RECEIPT_NULL_BYTES, headers=JSON_HEADERS)
+RESP_BASE_RECEIPT_FAILED = httpx.Response(200, content=MOCK_BASE_RECEIPT_FAILED_BYTES, headers=JSON_HEADERS)
 
 MOCK_SOLANA_TX = {
     "jsonrpc": "2.0",
@@ -128,3 +165,13 @@ MOCK_SOLANA_TX_NULL_BLOCKTIME = {
 }
 
 MOCK_SOLANA_TX_NULL = {"jsonrpc": "2.0", "id": 1, "result": None}
+
+MOCK_SOLANA_TX_BYTES = _json_bytes(MOCK_SOLANA_TX)
+MOCK_SOLANA_TX_FAILED_BYTES = _json_bytes(MOCK_SOLANA_TX_FAILED)
+MOCK_SOLANA_TX_NULL_BLOCKTIME_BYTES = _json_bytes(MOCK_SOLANA_TX_NULL_BLOCKTIME)
+MOCK_SOLANA_TX_NULL_BYTES = _json_bytes(MOCK_SOLANA_TX_NULL)
+
+RESP_SOLANA_TX = httpx.Response(200, content=MOCK_SOLANA_TX_BYTES, headers=JSON_HEADERS)
+RESP_SOLANA_TX_FAILED = httpx.Response(200, content=MOCK_SOLANA_TX_FAILED_BYTES, headers=JSON_HEADERS)
+RESP_SOLANA_TX_NULL_BLOCKTIME = httpx.Response(200, content=MOCK_SOLANA_TX_NULL_BLOCKTIME_BYTES, headers=JSON_HEADERS)
+RESP_SOLANA_TX_NULL = httpx.Response(200, content=MOCK_SOLANA_TX_NULL_BYTES, headers=JSON_HEADERS)
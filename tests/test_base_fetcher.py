@@ -1,87 +1,81 @@
 import httpx
 import pytest
-import respx
 from fastapi import HTTPException
 
 from app.config import settings
 from app.fetchers.base_fetcher import fetch_base_transaction
 from tests.conftest import (
-    MOCK_BASE_BLOCK,
-    MOCK_BASE_RECEIPT,
-    MOCK_BASE_RECEIPT_FAILED,
-    MOCK_BASE_RECEIPT_NULL,
-    MOCK_BASE_TX,
-    MOCK_BASE_TX_NULL,
+    RESP_BASE_BLOCK,
+    RESP_BASE_RECEIPT,
+    RESP_BASE_RECEIPT_FAILED,
+    RESP_BASE_RECEIPT_NULL,
+    RESP_BASE_TX,
+    RESP_BASE_TX_NULL,
 )
 
-TX_HASH = "0x" + "ab" * 32
-
-
-@respx.mock
-async def test_confirmed_transaction():
-    url = settings.base_rpc_url
-    respx.post(url).side_effect = [
-        httpx.Response(200, json=MOCK_BASE_TX),
-        httpx.Response(200, json=MOCK_BASE_RECEIPT),
-        httpx.Response(200, json=MOCK_BASE_BLOCK),
-    ]
-
-    result = await fetch_base_transaction(TX_HASH)
-
-    assert result.chain == "base"
-    assert result.tx_hash == TX_HASH
-    assert result.status == "confirmed"
-    assert result.from_address == "0x" + "11" * 20
-    assert result.to_address == "0x" + "22" * 20
-    assert result.fee.token == "ETH"
-    assert float(result.fee.amount) > 0
-    assert result.block_number == 1
-
-
-@respx.mock
-async def test_failed_transaction():
-    url = settings.base_rpc_url
-    respx.post(url).side_effect = [
-        httpx.Response(200, json=MOCK_BASE_TX),
-        httpx.Response(200, json=MOCK_BASE_RECEIPT_FAILED),
-        httpx.Response(200, json=MOCK_BASE_BLOCK),
-    ]
-
-    result = await fetch_base_transaction(TX_HASH)
-    assert result.status == "failed"
-
-
-@respx.mock
-async def test_pending_transaction():
-    url = settings.base_rpc_url
-    respx.post(url).side_effect = [
-        httpx.Response(200, json=MOCK_BASE_TX),
-        httpx.Response(200, json=MOCK_BASE_RECEIPT_NULL),
-    ]
-
-    result = await fetch_base_transaction(TX_HASH)
-    assert result.status == "pending"
-    assert result.fee.amount == "0"
-
-
-@respx.mock
-async def test_not_found():
-    url = settings.base_rpc_url
-    respx.post(url).side_effect = [
-        httpx.Response(200, json=MOCK_BASE_TX_NULL),
-        httpx.Response(200, json=MOCK_BASE_RECEIPT_NULL),
-    ]
-
-    with pytest.raises(HTTPException) as exc_info:
-        await fetch_base_transaction(TX_HASH)
-    assert exc_info.value.status_code == 404
+# One event loop for the whole module instead of one per test
+pytestmark = pytest.mark.asyncio(loop_scope="module")
 
+TX_HASH = "0x" + "ab" * 32
 
-@respx.mock
-async def test_timeout():
-    url = settings.base_rpc_url
-    respx.post(url).mock(side_effect=httpx.TimeoutException("timeout"))
 
-    with pytest.raises(HTTPException) as exc_info:
-        await fetch_base_transaction(TX_HASH)
-    assert exc_info.value.status_code == 504
+SCENARIOS = [
+    pytest.param(
+        [RESP_BASE_TX, RESP_BASE_RECEIPT, RESP_BASE_BLOCK],
+        {
+            "chain": "base",
+            "tx_hash": TX_HASH,
+            "status": "confirmed",
+            "from_address": "0x" + "11" * 20,
+            "to_address": "0x" + "22" * 20,
+            "fee": {"amount": "2.1e-05", "token": "ETH"},  # 21000 gas * 1 gwei
+            "block_number": 1,
+        },
+        None,
+        id="confirmed",
+    ),
+    pytest.param(
+        [RESP_BASE_TX, RESP_BASE_RECEIPT_FAILED, RESP_BASE_BLOCK],
+        {"status": "failed"},
+        None,
+        id="failed",
+    ),
+    pytest.param(
+        [RESP_BASE_TX, RESP_BASE_RECEIPT_NULL],
+        {"status": "pending", "fee": {"amount": "0", "token": "ETH"}},
+        None,
+        id="pending",
+    ),
+    pytest.param(
+        [RESP_BASE_TX_NULL, RESP_BASE_RECEIPT_NULL],
+        None,
+        404,
+        id="not_found",
+    ),
+    pytest.param(
+        httpx.TimeoutException("timeout"),
+        None,
+        504,
+        id="timeout",
+    ),
+]
+
+
+@pytest.fixture
+def base_rpc(respx_mock):
+    return respx_mock.post(settings.base_rpc_url)
+
+
+@pytest.mark.parametrize("side_effect, expected, expected_status_code", SCENARIOS)
+async def test_fetch_base_transaction(base_rpc, side_effect, expected, expected_status_code):
+    base_rpc.side_effect = side_effect
+
+    if expected_status_code is not None:
+        with pytest.raises(HTTPException) as exc_info:
+            await fetch_base_transaction(TX_HASH)
+        assert exc_info.value.status_code == expected_status_code
+        return
+
+    result = (await fetch_base_transaction(TX_HASH)).model_dump()
+    for field, value in expected.items():
+        assert result[field] == value
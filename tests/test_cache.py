@@ -5,15 +5,26 @@ from app.cache.manager import CACHE_MISS, TransactionCache
 from app.models.transaction import FeeInfo, NormalizedTransaction
 
 
-def _make_tx(chain: str = "base", tx_hash: str = "0x" + "ab" * 32) -> NormalizedTransaction:
-    return NormalizedTransaction(
-        chain=chain,
-        tx_hash=tx_hash,
-        status="confirmed",
-        from_address="0x" + "11" * 20,
-        fee=FeeInfo(amount="0.001", token="ETH"),
-        raw={},
-    )
+_DEFAULT_HASH = "0x" + "ab" * 32
+
+# Validated once; copies below skip the validators
+_PROTOTYPE = NormalizedTransaction(
+    chain="base",
+    tx_hash=_DEFAULT_HASH,
+    status="confirmed",
+    from_address="0x" + "11" * 20,
+    fee=FeeInfo(amount="0.001", token="ETH"),
+    raw={},
+)
+
+
+def _make_tx(
+    chain: str = "base", tx_hash: str = _DEFAULT_HASH, status: str = "confirmed"
+) -> NormalizedTransaction:
+    return _PROTOTYPE.model_copy(update={"chain": chain, "tx_hash": tx_hash, "status": status})
+
+
+HASHES = tuple(f"0x{i:064x}" for i in (0, 1, 2, 3, 99))
 
 
 class TestTransactionCache:
@@ -21,6 +32,11 @@ class TestTransactionCache:
         cache = TransactionCache()
         assert cache.get("base", "0xabc") is CACHE_MISS
 
+    def test_get_miss_custom_default(self):
+        cache = TransactionCache()
+        sentinel = object()
+        assert cache.get("base", "0xabc", default=sentinel) is sentinel
+
     def test_set_and_get(self):
         cache = TransactionCache()
         tx = _make_tx()
@@ -38,40 +54,39 @@ class TestTransactionCache:
     def test_ttl_expiry(self):
         cache = TransactionCache()
         tx = _make_tx()
-        cache.set("base", tx.tx_hash, tx, ttl=0.01)
-
-        assert cache.get("base", tx.tx_hash) is not CACHE_MISS
+        with patch("app.cache.manager._now") as now:
+            # set, first get, second get (past expiry)
+            now.side_effect = [100.0, 100.0, 100.03]
+            cache.set("base", tx.tx_hash, tx, ttl=0.01)
 
-        time.sleep(0.02)
-
-        assert cache.get("base", tx.tx_hash) is CACHE_MISS
+            assert cache.get("base", tx.tx_hash) is not CACHE_MISS
+            assert cache.get("base", tx.tx_hash) is CACHE_MISS
 
     def test_lru_eviction(self):
         cache = TransactionCache(max_entries=3)
 
         for i in range(3):
-            tx = _make_tx(tx_hash=f"0x{i:064x}")
+            tx = _make_tx(tx_hash=HASHES[i])
             cache.set("base", tx.tx_hash, tx)
 
         assert len(cache) == 3
 
         # Access first entry to make it recently used
-        cache.get("base", f"0x{0:064x}")
+        cache.get("base", HASHES[0])
 
         # Add a 4th entry — should evict the second (least recently used)
-        tx4 = _make_tx(tx_hash=f"0x{99:064x}")
+        tx4 = _make_tx(tx_hash=HASHES[4])
         cache.set("base", tx4.tx_hash, tx4)
 
         assert len(cache) == 3
         # Second entry (index 1) should be evicted
-        assert cache.get("base", f"0x{1:064x}") is CACHE_MISS
+        assert cache.get("base", HASHES[1]) is CACHE_MISS
         # First entry should still be there (was accessed recently)
-        assert cache.get("base", f"0x{0:064x}") is not CACHE_MISS
+        assert cache.get("base", HASHES[0]) is not CACHE_MISS
 
     def test_pending_tx_gets_short_ttl(self):
         cache = TransactionCache()
-        tx = _make_tx()
-        tx = tx.model_copy(update={"status": "pending"})
+        tx = _make_tx(status="pending")
         cache.set("base", tx.tx_hash, tx)
 
         entry = cache._store[cache._key("base", tx.tx_hash)]
@@ -3,14 +3,17 @@
 from app.classifiers import normalize_actions
 from app.classifiers.evm_classifier import classify_evm_actions
 from app.classifiers.solana_classifier import classify_solana_actions
+from tests._helpers import _transfer_log
 
 USER = "0x" + "11" * 20
 OTHER = "0x" + "22" * 20
-TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+_ZEROS = "0" * 39
 
-
-def _pad_address(addr: str) -> str:
-    return "0x" + addr[2:].zfill(64)
+# Seven distinct tokens each transferring into USER; shared read-only by the overflow tests
+_INCOMING_TRANSFER_LOGS = tuple(
+    _transfer_log(f"0x{_ZEROS}{i}", f"0x{_ZEROS}{i}", USER, 1000000 * (i + 1))
+    for i in range(7)
+)
 
 
 class TestContractCreation:
@@ -141,18 +144,7 @@ class TestNormalizeActions:
             "transaction": {"from": USER, "to": OTHER, "value": "0x0", "input": "0x"},
             "receipt": {
                 "from": USER,
-                "logs": [
-                    {
-                        "address": f"0x{'0' * 39}{i}",
-                        "topics": [
-                            TRANSFER_TOPIC,
-                            _pad_address(f"0x{'0' * 39}{i}"),
-                            _pad_address(USER),
-                        ],
-                        "data": hex(1000000 * (i + 1)),
-                    }
-                    for i in range(7)
-                ],
+                "logs": _INCOMING_TRANSFER_LOGS,
             },
         }
         actions = normalize_actions(raw, "base")
@@ -166,18 +158,7 @@ class TestNormalizeActions:
             "transaction": {"from": USER, "to": OTHER, "value": "0x0", "input": "0x"},
             "receipt": {
                 "from": USER,
-                "logs": [
-                    {
-                        "address": f"0x{'0' * 39}{i}",
-                        "topics": [
-                            TRANSFER_TOPIC,
-                            _pad_address(f"0x{'0' * 39}{i}"),
-                            _pad_address(USER),
-                        ],
-                        "data": hex(1000000 * (i + 1)),
-                    }
-                    for i in range(5)
-                ],
+                "logs": _INCOMING_TRANSFER_LOGS[:5],
             },
         }
         actions = normalize_actions(raw, "base")
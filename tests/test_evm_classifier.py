@@ -1,24 +1,20 @@
 """Tests for the EVM action classifier using net token delta approach."""
 
+import pytest
+
 from app.classifiers.evm_classifier import classify_evm_actions
+from tests._helpers import TRANSFER_TOPIC, TRANSFER_TOPIC_B, _pad_address, _transfer_log
 
 USER = "0x" + "11" * 20
 OTHER = "0x" + "22" * 20
 USDC = "0x833589fcd6edb6e08f4c7c32d4f71b54bda02913"
 WETH = "0x4200000000000000000000000000000000000006"
 
-# ERC20 Transfer topic
-TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
 WETH_DEPOSIT = "0xe1fffcc4923d04b559f4d29a8bfc6cda04eb5b0d3c460751c2402c5c5cc9109c"
 WETH_WITHDRAWAL = "0x7fcf532c15f0a6db0bd6d0e038bea71d30d808c7d98cb3bf7268a95bf5081b65"
 APPROVAL_TOPIC = "0x8c5be1e5ebec7d5bd14f71427d1e84f3dd0314c0f7b2291e5b200ac8c7c3b925"
 
 
-def _pad_address(addr: str) -> str:
-    """Pad address to 32 bytes for event topics."""
-    return "0x" + addr[2:].zfill(64)
-
-
 def _encode_uint256(value: int) -> str:
     return hex(value)
 
@@ -33,17 +29,9 @@ class TestSwapClassification:
                 "from": USER,
                 "logs": [
                     # User sends 100 USDC
-                    {
-                        "address": USDC,
-                        "topics": [TRANSFER_TOPIC, _pad_address(USER), _pad_address(OTHER)],
-                        "data": _encode_uint256(100_000_000),  # 100 USDC (6 decimals)
-                    },
+                    _transfer_log(USDC, USER, OTHER, 100_000_000),  # 100 USDC (6 decimals)
                     # User receives token B
-                    {
-                        "address": token_b,
-                        "topics": [TRANSFER_TOPIC, _pad_address(OTHER), _pad_address(USER)],
-                        "data": _encode_uint256(50_000_000_000_000_000_000),  # 50 tokens (18 decimals)
-                    },
+                    _transfer_log(token_b, OTHER, USER, 50_000_000_000_000_000_000),  # 50 tokens (18 decimals)
                 ],
             },
         }
@@ -62,11 +50,7 @@ class TestSwapClassification:
                 "from": USER,
                 "logs": [
                     # User sends USDC
-                    {
-                        "address": USDC,
-                        "topics": [TRANSFER_TOPIC, _pad_address(USER), _pad_address(OTHER)],
-                        "data": _encode_uint256(100_000_000),
-                    },
+                    _transfer_log(USDC, USER, OTHER, 100_000_000),
                     # WETH Withdrawal event (user unwraps WETH → ETH)
                     {
                         "address": WETH,
@@ -74,11 +58,7 @@ class TestSwapClassification:
                         "data": _encode_uint256(50_000_000_000_000_000),  # 0.05 ETH
                     },
                     # WETH transferred to user (ERC20 transfer part of unwrap)
-                    {
-                        "address": WETH,
-                        "topics": [TRANSFER_TOPIC, _pad_address(OTHER), _pad_address(USER)],
-                        "data": _encode_uint256(50_000_000_000_000_000),
-                    },
+                    _transfer_log(WETH, OTHER, USER, 50_000_000_000_000_000),
                 ],
             },
         }
@@ -95,11 +75,7 @@ class TestSwapClassification:
             "receipt": {
                 "from": USER,
                 "logs": [
-                    {
-                        "address": token_b,
-                        "topics": [TRANSFER_TOPIC, _pad_address(OTHER), _pad_address(USER)],
-                        "data": _encode_uint256(1000_000_000),
-                    },
+                    _transfer_log(token_b, OTHER, USER, 1000_000_000),
                 ],
             },
         }
@@ -116,11 +92,7 @@ class TestTransferClassification:
             "receipt": {
                 "from": USER,
                 "logs": [
-                    {
-                        "address": USDC,
-                        "topics": [TRANSFER_TOPIC, _pad_address(USER), _pad_address(OTHER)],
-                        "data": _encode_uint256(100_000_000),
-                    },
+                    _transfer_log(USDC, USER, OTHER, 100_000_000),
                 ],
             },
         }
@@ -135,11 +107,7 @@ class TestTransferClassification:
             "receipt": {
                 "from": USER,
                 "logs": [
-                    {
-                        "address": USDC,
-                        "topics": [TRANSFER_TOPIC, _pad_address(OTHER), _pad_address(USER)],
-                        "data": _encode_uint256(50_000_000),
-                    },
+                    _transfer_log(USDC, OTHER, USER, 50_000_000),
                 ],
             },
         }
@@ -147,6 +115,28 @@ class TestTransferClassification:
         assert actions[0].type == "transfer"
         assert actions[0].token_out.address == USDC
 
+    @pytest.mark.parametrize(
+        "topics",
+        [
+            [TRANSFER_TOPIC, _pad_address(OTHER), _pad_address(USER)],
+            [TRANSFER_TOPIC_B, bytes.fromhex(_pad_address(OTHER)[2:]), bytes.fromhex(_pad_address(USER)[2:])],
+        ],
+        ids=["hex", "bytes"],
+    )
+    def test_erc20_receive_topic_encodings(self, topics):
+        """Hex-string and raw-bytes topics classify identically."""
+        raw = {
+            "transaction": {"from": USER, "to": USDC, "value": "0x0", "input": "0x"},
+            "receipt": {
+                "from": USER,
+                "logs": [{"address": USDC, "topics": topics, "data": _encode_uint256(50_000_000)}],
+            },
+        }
+        actions = classify_evm_actions(raw)
+        assert actions[0].type == "transfer"
+        assert actions[0].token_out.address == USDC
+        assert actions[0].token_out.amount == "50000000"
+
     def test_native_eth_transfer(self):
         """Pure ETH transfer with no logs → transfer."""
         raw = {
@@ -260,16 +250,8 @@ class TestProtocolLabeling:
             "receipt": {
                 "from": USER,
                 "logs": [
-                    {
-                        "address": USDC,
-                        "topics": [TRANSFER_TOPIC, _pad_address(USER), _pad_address(OTHER)],
-                        "data": _encode_uint256(100),
-                    },
-                    {
-                        "address": "0x" + "aa" * 20,
-                        "topics": [TRANSFER_TOPIC, _pad_address(OTHER), _pad_address(USER)],
-                        "data": _encode_uint256(200),
-                    },
+                    _transfer_log(USDC, USER, OTHER, 100),
+                    _transfer_log("0x" + "aa" * 20, OTHER, USER, 200),
                 ],
             },
         }
@@ -282,11 +264,7 @@ class TestProtocolLabeling:
             "receipt": {
                 "from": USER,
                 "logs": [
-                    {
-                        "address": USDC,
-                        "topics": [TRANSFER_TOPIC, _pad_address(USER), _pad_address(OTHER)],
-                        "data": _encode_uint256(100),
-                    },
+                    _transfer_log(USDC, USER, OTHER, 100),
                 ],
             },
         }
@@ -1,12 +1,15 @@
 """Tests for filesystem-based receipt cache."""
 
 import json
+import os
+import sys
+import threading
 import time
 from pathlib import Path
 
 import pytest
 
-from app.cache.file_cache import FileCache
+from app.cache.file_cache import CONFIRMED_TTL, FileCache
 
 
 @pytest.fixture
@@ -24,6 +27,37 @@ class TestImageCache:
     def test_get_missing_image(self, cache):
         assert cache.get_image("base", "0xmissing", "classic") is None
 
+    def test_identical_images_share_storage(self, cache):
+        import os
+        first = cache.set_image("base", "0x1", "classic", b"same png")
+        second = cache.set_image("base", "0x2", "classic", b"same png")
+        assert os.stat(first).st_ino == os.stat(second).st_ino
+
+    def test_overwrite_does_not_touch_shared_blob(self, cache):
+        cache.set_image("base", "0x1", "classic", b"same png")
+        cache.set_image("base", "0x2", "classic", b"same png")
+        cache.set_image("base", "0x2", "classic", b"new png")
+        assert cache.get_image("base", "0x1", "classic") == b"same png"
+        assert cache.get_image("base", "0x2", "classic") == b"new png"
+
+    def test_lost_link_race_does_not_touch_shared_blob(self, cache, monkeypatch):
+        shared = cache.set_image("base", "0x1", "classic", b"same png")
+
+        def link_lost_race(src, dst):
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            os.link(shared, dst)  # a concurrent writer linked first
+            raise FileExistsError(dst)
+
+        monkeypatch.setattr(cache, "_link", link_lost_race)
+        cache.set_image("base", "0x2", "classic", b"new png")
+        assert cache.get_image("base", "0x1", "classic") == b"same png"
+        assert cache.get_image("base", "0x2", "classic") == b"new png"
+
+    def test_get_image_path(self, cache):
+        cache.set_image("base", "0xabc", "classic", b"png")
+        assert cache.get_image_path("base", "0xabc", "classic").read_bytes() == b"png"
+        assert cache.get_image_path("base", "0xabc", "dark") is None
+
     def test_different_templates_stored_separately(self, cache):
         cache.set_image("base", "0xabc", "classic", b"classic_png")
         cache.set_image("base", "0xabc", "dark", b"dark_png")
@@ -50,6 +84,18 @@ class TestSummaryCache:
         assert result["action_label"] == "Sent"
 
 
+class TestReceiptBundle:
+    def test_set_receipt_stores_summary_and_image(self, cache):
+        cache.set_receipt("base", "0xabc", "dark", {"action_label": "Sent"}, b"png")
+        assert cache.get_summary("base", "0xabc") == {"action_label": "Sent"}
+        assert cache.get_image("base", "0xabc", "dark") == b"png"
+
+    def test_set_receipt_without_image(self, cache):
+        cache.set_receipt("base", "0xabc", "classic", {"action_label": "Sent"})
+        assert cache.get_summary("base", "0xabc") is not None
+        assert cache.get_image("base", "0xabc", "classic") is None
+
+
 class TestNegativeCache:
     def test_pending(self, cache):
         cache.set_negative("base", "0xpending", "pending")
@@ -59,6 +105,10 @@ class TestNegativeCache:
         cache.set_negative("base", "0xgone", "not_found")
         assert cache.get_negative("base", "0xgone") == "not_found"
 
+    async def test_async_wrappers(self, cache):
+        await cache.aset_negative("base", "0xpending", "pending")
+        assert await cache.aget_negative("base", "0xpending") == "pending"
+
     def test_missing_negative(self, cache):
         assert cache.get_negative("base", "0xnone") is None
 
@@ -80,6 +130,58 @@ class TestNegativeCache:
         assert cache.get_negative("base", "0xgone") is None
 
 
+class TestMemoryTier:
+    def test_hot_summary_served_from_memory(self, cache):
+        cache.set_summary("base", "0xabc", {"action_label": "Sent"})
+        cache._path(cache._summary_key("base", "0xabc")).unlink()
+        assert cache.get_summary("base", "0xabc") == {"action_label": "Sent"}
+
+    def test_disk_hit_populates_memory(self, tmp_path):
+        writer = FileCache(cache_dir=tmp_path / "shared")
+        writer.set_summary("base", "0xabc", {"action_label": "Sent"})
+        reader = FileCache(cache_dir=tmp_path / "shared")
+        assert reader.get_summary("base", "0xabc") == {"action_label": "Sent"}
+        assert reader._summary_key("base", "0xabc") in reader._mem
+
+    def test_lru_bound(self, cache, monkeypatch):
+        monkeypatch.setattr("app.cache.file_cache.MEM_MAX_ENTRIES", 2)
+        for tx in ("0x1", "0x2", "0x3"):
+            cache.set_summary("base", tx, {"tx": tx})
+        assert len(cache._mem) == 2
+        assert cache._summary_key("base", "0x1") not in cache._mem
+
+    def test_concurrent_writers_and_reader(self, cache, monkeypatch):
+        """set_receipt writes from the threadpool while get_summary reads on the loop."""
+        monkeypatch.setattr("app.cache.file_cache.MEM_MAX_ENTRIES", 8)
+        monkeypatch.setattr(cache, "_write", lambda path, data: None)  # exercise only the memory tier
+        keys = [f"0x{i:04x}" for i in range(32)]
+        errors = []
+
+        def writer():
+            try:
+                for _ in range(1000):
+                    for tx in keys:
+                        cache.set_summary("base", tx, {"tx": tx})
+            except Exception as exc:
+                errors.append(exc)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # interleave the threads inside dict operations
+        try:
+            threads = [threading.Thread(target=writer) for _ in range(3)]
+            for t in threads:
+                t.start()
+            while any(t.is_alive() for t in threads):
+                for tx in keys:
+                    cache.get_summary("base", tx)
+            for t in threads:
+                t.join()
+        finally:
+            sys.setswitchinterval(interval)
+        assert errors == []
+        assert len(cache._mem) <= 8
+
+
 class TestCacheMaintenance:
     def test_clear(self, cache):
         cache.set_image("base", "0x1", "classic", b"data")
@@ -90,6 +192,10 @@ class TestCacheMaintenance:
         assert cache.get_summary("base", "0x1") is None
         assert cache.get_negative("base", "0x2") is None
 
+    def test_entries_sharded_by_hash_prefix(self, cache):
+        path = cache.set_image("base", "0xabcdef", "classic", b"data")
+        assert path.parent.relative_to(cache._dir) == Path("ab/cd")
+
     def test_cleanup_expired(self, cache):
         cache.set_negative("base", "0xold", "not_found")
         # Backdate beyond TTL
@@ -101,3 +207,17 @@ class TestCacheMaintenance:
         removed = cache.cleanup_expired()
         assert removed >= 1
         assert cache.get_negative("base", "0xold") is None
+
+    def test_cleanup_negative_only(self, cache):
+        import os
+        cache.set_image("base", "0x1", "classic", b"data")
+        cache.set_negative("base", "0xold", "not_found")
+        old_time = time.time() - CONFIRMED_TTL - 1
+        for path in (
+            cache._path(cache._image_key("base", "0x1", "classic")),
+            cache._path(cache._negative_key("base", "0xold")),
+        ):
+            os.utime(path, (old_time, old_time))
+
+        assert cache.cleanup_expired(negative_only=True) == 1
+        assert cache._path(cache._image_key("base", "0x1", "classic")).exists()
@@ -20,6 +20,30 @@ def clean_file_cache(tmp_path):
     file_cache.clear()
 
 
+# Built once; the handlers only read it
+MOCK_TX = NormalizedTransaction(
+    chain="base",
+    tx_hash="0x" + "ab" * 32,
+    status="confirmed",
+    block_number=12345,
+    from_address="0x" + "11" * 20,
+    to_address="0x" + "22" * 20,
+    fee=FeeInfo(amount="0.001", token="ETH"),
+    raw={
+        "transaction": {
+            "from": "0x" + "11" * 20,
+            "to": "0x" + "22" * 20,
+            "value": "0xde0b6b3a7640000",
+            "input": "0x",
+        },
+        "receipt": {
+            "from": "0x" + "11" * 20,
+            "logs": [],
+        },
+    },
+)
+
+
 class TestOGPage:
     def test_og_page_returns_html(self):
         tx = "0x" + "ab" * 32
@@ -71,12 +95,35 @@ class TestOGPage:
         resp = client.get("/receipt/base/not_a_hash")
         assert resp.status_code == 400
 
+    def test_og_page_etag_revalidation(self):
+        tx = "0x" + "ab" * 32
+        etag = client.get(f"/receipt/base/{tx}").headers["etag"]
+
+        resp = client.get(f"/receipt/base/{tx}", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+
+        file_cache.set_summary("base", tx, {"chain": "base", "action_label": "Sent", "action_detail": "1 ETH"})
+        resp = client.get(f"/receipt/base/{tx}", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["etag"] != etag
+
     def test_og_page_image_url_format(self):
         tx = "0x" + "ab" * 32
         resp = client.get(f"/receipt/base/{tx}")
         assert f"/v1/receipt/base/card/{tx}/classic.png" in resp.text
 
 
+class TestCardImageEndpoint:
+    def test_cached_image_served_from_disk(self):
+        tx = "0x" + "ab" * 32
+        file_cache.set_image("base", tx, "classic", b"\x89PNG cached")
+        resp = client.get(f"/v1/receipt/base/card/{tx}/classic.png")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "image/png"
+        assert resp.content == b"\x89PNG cached"
+
+
 class TestReceiptInfoEndpoint:
     def test_get_base_info(self):
         resp = client.get("/v1/receipt/base")
@@ -119,32 +166,9 @@ class TestBuildOgTitle:
 class TestPostReceiptGeneration:
     """Integration tests for the POST /v1/receipt/{chain} endpoint."""
 
-    def _make_mock_tx(self):
-        return NormalizedTransaction(
-            chain="base",
-            tx_hash="0x" + "ab" * 32,
-            status="confirmed",
-            block_number=12345,
-            from_address="0x" + "11" * 20,
-            to_address="0x" + "22" * 20,
-            fee=FeeInfo(amount="0.001", token="ETH"),
-            raw={
-                "transaction": {
-                    "from": "0x" + "11" * 20,
-                    "to": "0x" + "22" * 20,
-                    "value": "0xde0b6b3a7640000",
-                    "input": "0x",
-                },
-                "receipt": {
-                    "from": "0x" + "11" * 20,
-                    "logs": [],
-                },
-            },
-        )
-
     @patch("app.main.fetch_transaction")
     def test_json_response(self, mock_fetch):
-        mock_fetch.return_value = self._make_mock_tx()
+        mock_fetch.return_value = MOCK_TX
         resp = client.post("/v1/receipt/base", json={"tx_hash": "0x" + "ab" * 32, "format": "json"})
         assert resp.status_code == 200
         data = resp.json()
@@ -156,22 +180,33 @@ class TestPostReceiptGeneration:
 
     @patch("app.main.fetch_transaction")
     def test_svg_response(self, mock_fetch):
-        mock_fetch.return_value = self._make_mock_tx()
+        mock_fetch.return_value = MOCK_TX
         resp = client.post("/v1/receipt/base", json={"tx_hash": "0x" + "ab" * 32, "format": "svg"})
         assert resp.status_code == 200
         assert "image/svg+xml" in resp.headers["content-type"]
         assert resp.text.startswith("<svg")
 
+    @patch("app.main.fetch_transaction")
+    def test_svg_served_from_cache(self, mock_fetch):
+        mock_fetch.return_value = MOCK_TX
+        body = {"tx_hash": "0x" + "ab" * 32, "format": "svg"}
+        first = client.post("/v1/receipt/base", json=body)
+        with patch("app.main.render_receipt_card") as mock_render:
+            second = client.post("/v1/receipt/base", json=body)
+        assert second.status_code == 200
+        assert second.text == first.text
+        mock_render.assert_not_called()
+
     @patch("app.main.fetch_transaction")
     def test_invalid_template_defaults_to_classic(self, mock_fetch):
-        mock_fetch.return_value = self._make_mock_tx()
+        mock_fetch.return_value = MOCK_TX
         resp = client.post("/v1/receipt/base", json={"tx_hash": "0x" + "ab" * 32, "template": "neon", "format": "svg"})
         assert resp.status_code == 200
         assert "#FFFFFF" in resp.text  # classic background
 
     @patch("app.main.fetch_transaction")
     def test_invalid_format_defaults_to_json(self, mock_fetch):
-        mock_fetch.return_value = self._make_mock_tx()
+        mock_fetch.return_value = MOCK_TX
         resp = client.post("/v1/receipt/base", json={"tx_hash": "0x" + "ab" * 32, "format": "gif"})
         assert resp.status_code == 200
         assert "summary" in resp.json()
@@ -200,7 +235,7 @@ class TestPostReceiptGeneration:
 
     @patch("app.main.fetch_transaction")
     def test_cached_json_returns_cached(self, mock_fetch):
-        tx = self._make_mock_tx()
+        tx = MOCK_TX
         mock_fetch.return_value = tx
         tx_hash = "0x" + "ab" * 32
 
@@ -209,10 +244,21 @@ class TestPostReceiptGeneration:
 
         # Second call should use cache (fetch_transaction not called again)
         mock_fetch.reset_mock()
-        resp = client.post("/v1/receipt/base", json={"tx_hash": tx_hash, "format": "json"})
+        with patch("app.main.render_receipt_card") as mock_render:
+            resp = client.post("/v1/receipt/base", json={"tx_hash": tx_hash, "format": "json"})
         assert resp.status_code == 200
         assert resp.json()["card"]["cached"] is True
         mock_fetch.assert_not_called()
+        mock_render.assert_not_called()
+
+    @patch("app.main.fetch_transaction")
+    def test_summary_written_to_file_cache(self, mock_fetch):
+        mock_fetch.return_value = MOCK_TX
+        tx_hash = "0x" + "ab" * 32
+
+        client.post("/v1/receipt/base", json={"tx_hash": tx_hash, "format": "svg"})
+
+        assert file_cache.get_summary("base", tx_hash)["tx_hash"] == tx_hash
 
     @patch("app.main.fetch_transaction")
     def test_negative_cache_not_found(self, mock_fetch):
@@ -1,5 +1,9 @@
 """Tests for the SVG card renderer."""
 
+from types import MappingProxyType
+
+import pytest
+
 from app.models.action import Action, NFTInfo, TokenInfo
 from app.renderer.card import _apply_decimals, build_summary
 from app.renderer.svg_builder import (
@@ -9,6 +13,7 @@ from app.renderer.svg_builder import (
     _token_color,
     _truncate_address,
     render_receipt_svg,
+    render_receipts_svg,
 )
 
 
@@ -55,86 +60,100 @@ class TestHelpers:
     def test_format_amount_invalid(self):
         assert _format_amount("not_a_number") == "not_a_number"
 
+    def test_format_amount_long_integer_exact(self):
+        assert _format_amount("12345678901234567890") == "12,345,678,901,234,567,890"
+
+    def test_format_amount_long_fraction_exact(self):
+        assert _format_amount("1.234567890123456789") == "1.2346"
+        assert _format_amount("0.000000123456789012") == "0.0000001235"
+
+
+# Built once per class; tests that need a variant copy with {**base_tx, ...}
+@pytest.fixture(scope="class")
+def base_tx():
+    return MappingProxyType({
+        "chain": "base",
+        "tx_hash": "0x" + "ab" * 32,
+        "status": "confirmed",
+        "block_number": 12345678,
+        "block_time": "2026-02-12T08:00:00+00:00",
+        "from_address": "0x" + "11" * 20,
+        "to_address": "0x" + "22" * 20,
+        "fee": {"amount": "0.0001", "token": "ETH"},
+        "raw": {},
+    })
+
+
+@pytest.fixture(scope="class")
+def swap_action():
+    return Action(
+        type="swap",
+        primary=True,
+        token_in=TokenInfo(address="0x833589fcd6edb6e08f4c7c32d4f71b54bda02913", symbol="USDC", amount="100", decimals=6),
+        token_out=TokenInfo(address="native", symbol="ETH", amount="0.035", decimals=18),
+        protocol="Uniswap V3",
+    )
 
-class TestRenderReceiptSVG:
-    def _make_tx_dict(self, chain="base"):
-        return {
-            "chain": chain,
-            "tx_hash": "0x" + "ab" * 32,
-            "status": "confirmed",
-            "block_number": 12345678,
-            "block_time": "2026-02-12T08:00:00+00:00",
-            "from_address": "0x" + "11" * 20,
-            "to_address": "0x" + "22" * 20,
-            "fee": {"amount": "0.0001", "token": "ETH"},
-            "raw": {},
-        }
 
-    def _make_swap_action(self):
-        return Action(
-            type="swap",
-            primary=True,
-            token_in=TokenInfo(address="0x833589fcd6edb6e08f4c7c32d4f71b54bda02913", symbol="USDC", amount="100", decimals=6),
-            token_out=TokenInfo(address="native", symbol="ETH", amount="0.035", decimals=18),
-            protocol="Uniswap V3",
-        )
-
-    def test_classic_template_generates_valid_svg(self):
-        svg = render_receipt_svg(self._make_tx_dict(), [self._make_swap_action()], "classic")
+class TestRenderReceiptSVG:
+    def test_classic_template_generates_valid_svg(self, base_tx, swap_action):
+        svg = render_receipt_svg(base_tx, [swap_action], "classic")
         assert svg.startswith("<svg")
         assert "</svg>" in svg
         assert "ONCHAIN RECEIPT" in svg
 
-    def test_minimal_template(self):
-        svg = render_receipt_svg(self._make_tx_dict(), [self._make_swap_action()], "minimal")
+    def test_batch_matches_single_renders(self, base_tx, swap_action):
+        txs = [base_tx, {**base_tx, "chain": "solana"}]
+        actions_list = [[swap_action], []]
+        svgs = render_receipts_svg(txs, actions_list, "dark")
+        assert svgs == [render_receipt_svg(tx, a, "dark") for tx, a in zip(txs, actions_list)]
+
+    def test_minimal_template(self, base_tx, swap_action):
+        svg = render_receipt_svg(base_tx, [swap_action], "minimal")
         assert "#0D1117" in svg  # minimal background color
 
-    def test_dark_template(self):
-        svg = render_receipt_svg(self._make_tx_dict(), [self._make_swap_action()], "dark")
+    def test_dark_template(self, base_tx, swap_action):
+        svg = render_receipt_svg(base_tx, [swap_action], "dark")
         assert "#0A0A0F" in svg  # dark background color
 
-    def test_swap_action_rendered(self):
-        svg = render_receipt_svg(self._make_tx_dict(), [self._make_swap_action()])
+    def test_swap_action_rendered(self, base_tx, swap_action):
+        svg = render_receipt_svg(base_tx, [swap_action])
         assert "Swapped" in svg
         assert "USDC" in svg
         assert "ETH" in svg
         assert "Uniswap V3" in svg
 
-    def test_transfer_action_rendered(self):
+    def test_transfer_action_rendered(self, base_tx):
         action = Action(
             type="transfer",
             primary=True,
             token_in=TokenInfo(address="native", symbol="ETH", amount="1.5", decimals=18),
         )
-        svg = render_receipt_svg(self._make_tx_dict(), [action])
+        svg = render_receipt_svg(base_tx, [action])
         assert "Sent" in svg
         assert "ETH" in svg
 
-    def test_confirmed_status_badge(self):
-        svg = render_receipt_svg(self._make_tx_dict(), [self._make_swap_action()])
+    def test_confirmed_status_badge(self, base_tx, swap_action):
+        svg = render_receipt_svg(base_tx, [swap_action])
         assert "CONFIRMED" in svg
 
-    def test_failed_status_badge(self):
-        tx = self._make_tx_dict()
-        tx["status"] = "failed"
-        svg = render_receipt_svg(tx, [self._make_swap_action()])
+    def test_failed_status_badge(self, base_tx, swap_action):
+        tx = {**base_tx, "status": "failed"}
+        svg = render_receipt_svg(tx, [swap_action])
         assert "FAILED" in svg
 
-    def test_pending_status_badge(self):
-        tx = self._make_tx_dict()
-        tx["status"] = "pending"
-        svg = render_receipt_svg(tx, [self._make_swap_action()])
+    def test_pending_status_badge(self, base_tx, swap_action):
+        tx = {**base_tx, "status": "pending"}
+        svg = render_receipt_svg(tx, [swap_action])
         assert "PENDING" in svg
 
-    def test_null_block_time(self):
-        tx = self._make_tx_dict()
-        tx["block_time"] = None
-        svg = render_receipt_svg(tx, [self._make_swap_action()])
+    def test_null_block_time(self, base_tx, swap_action):
+        tx = {**base_tx, "block_time": None}
+        svg = render_receipt_svg(tx, [swap_action])
         assert "Timestamp unavailable" in svg
 
-    def test_solana_chain(self):
-        tx = self._make_tx_dict(chain="solana")
-        tx["fee"] = {"amount": "0.000005", "token": "SOL"}
+    def test_solana_chain(self, base_tx):
+        tx = {**base_tx, "chain": "solana", "fee": {"amount": "0.000005", "token": "SOL"}}
         action = Action(
             type="swap",
             primary=True,
@@ -146,38 +165,38 @@ class TestRenderReceiptSVG:
         assert "SOLANA" in svg
         assert "#9945FF" in svg  # Solana chain color
 
-    def test_contract_call_action(self):
+    def test_contract_call_action(self, base_tx):
         action = Action(type="contract_call", primary=True, note="Function: 0xabcd1234")
-        svg = render_receipt_svg(self._make_tx_dict(), [action])
+        svg = render_receipt_svg(base_tx, [action])
         assert "Contract Call" in svg
 
-    def test_nft_transfer_action(self):
+    def test_nft_transfer_action(self, base_tx):
         action = Action(
             type="nft_transfer",
             primary=True,
             nft=NFTInfo(token_id="42"),
             token_out=TokenInfo(address="0x" + "dd" * 20, symbol="NFT #42", amount="1", decimals=0),
         )
-        svg = render_receipt_svg(self._make_tx_dict(), [action])
+        svg = render_receipt_svg(base_tx, [action])
         assert "NFT #42" in svg
 
-    def test_powered_by_footer(self):
-        svg = render_receipt_svg(self._make_tx_dict(), [self._make_swap_action()])
+    def test_powered_by_footer(self, base_tx, swap_action):
+        svg = render_receipt_svg(base_tx, [swap_action])
         assert "powered by APIX402" in svg
 
-    def test_token_circles_rendered(self):
-        svg = render_receipt_svg(self._make_tx_dict(), [self._make_swap_action()])
+    def test_token_circles_rendered(self, base_tx, swap_action):
+        svg = render_receipt_svg(base_tx, [swap_action])
         # Should have circle elements for token visual
         assert "<circle" in svg
 
-    def test_xml_escaping(self):
+    def test_xml_escaping(self, base_tx):
         """Ensure special characters don't break SVG."""
         action = Action(
             type="transfer",
             primary=True,
             token_in=TokenInfo(address="native", symbol="A<B>C", amount="1"),
         )
-        svg = render_receipt_svg(self._make_tx_dict(), [action])
+        svg = render_receipt_svg(base_tx, [action])
         assert "A&lt;B&gt;C" in svg
         assert "<svg" in svg  # Still valid SVG structure
 
@@ -223,6 +242,15 @@ class TestApplyDecimals:
         assert result.token_in.amount == "1.0"
         assert result.token_out.amount == "2.0"
 
+    def test_evm_keeps_full_precision(self):
+        """Integer amounts scale exactly instead of through float."""
+        action = Action(
+            type="transfer",
+            token_in=TokenInfo(address="native", symbol="ETH", amount="1234567890123456789", decimals=18),
+        )
+        result = _apply_decimals(action, "base")
+        assert result.token_in.amount == "1.234567890123456789"
+
     def test_solana_not_converted(self):
         """Solana amounts are already human-readable — should NOT be touched."""
         action = Action(
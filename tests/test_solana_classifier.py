@@ -1,5 +1,9 @@
 """Tests for the Solana action classifier using net token delta approach."""
 
+from collections.abc import Mapping
+from functools import lru_cache
+from types import MappingProxyType
+
 from app.classifiers.solana_classifier import classify_solana_actions
 
 SIGNER = "So11111111111111111111111111111111111111112"
@@ -8,48 +12,64 @@ BONK_MINT = "DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263"
 JUPITER_PROGRAM = "JUP6LkbZbjS1jKKwapdHNy74zcZ3tLUZoi5QNyVTaV4"
 
 
-def _make_token_balance(account_index: int, mint: str, amount: float, decimals: int, owner: str) -> dict:
-    return {
+@lru_cache(maxsize=None)
+def _make_token_balance(account_index: int, mint: str, amount: float, decimals: int, owner: str) -> Mapping:
+    # Cached and read-only: the classifier only reads balances, so tests share them
+    return MappingProxyType({
         "accountIndex": account_index,
         "mint": mint,
         "owner": owner,
-        "uiTokenAmount": {
+        "uiTokenAmount": MappingProxyType({
             "uiAmount": amount,
             "decimals": decimals,
             "amount": str(int(amount * (10 ** decimals))),
-        },
-    }
+        }),
+    })
+
+
+# Account keys stay plain dicts: the classifier tells parsed keys from bare strings by type
+_SIGNER_KEY = {"pubkey": SIGNER, "signer": True}
+_JUPITER_KEY = {"pubkey": JUPITER_PROGRAM, "signer": False}
+
+
+def _tx(*account_keys: dict) -> Mapping:
+    return MappingProxyType({"message": MappingProxyType({"accountKeys": account_keys, "instructions": ()})})
+
+
+_TX_SIGNER_ONLY = _tx(_SIGNER_KEY)
+_TX_WITH_JUPITER = _tx(_SIGNER_KEY, _JUPITER_KEY)
+
+_BASE_META_CONFIRMED = MappingProxyType({
+    "fee": 5000,
+    "err": None,
+    "preBalances": (1_000_000_000,),
+    "postBalances": (999_995_000,),
+    "preTokenBalances": (),
+    "postTokenBalances": (),
+})
+
+
+def _make_raw(tx: Mapping = _TX_SIGNER_ONLY, **meta) -> dict:
+    """A confirmed signer-only tx; keyword arguments override ``meta`` fields."""
+    return {"transaction": tx, "meta": _BASE_META_CONFIRMED | meta}
 
 
 class TestSwapClassification:
     def test_simple_token_swap(self):
         """User loses USDC, gains BONK → swap."""
-        raw = {
-            "transaction": {
-                "message": {
-                    "accountKeys": [
-                        {"pubkey": SIGNER, "signer": True},
-                        {"pubkey": "other_account", "signer": False},
-                        {"pubkey": JUPITER_PROGRAM, "signer": False},
-                    ],
-                    "instructions": [],
-                },
-            },
-            "meta": {
-                "fee": 5000,
-                "err": None,
-                "preBalances": [1_000_000_000, 0, 0],
-                "postBalances": [999_995_000, 0, 0],
-                "preTokenBalances": [
-                    _make_token_balance(0, USDC_MINT, 100.0, 6, SIGNER),
-                    _make_token_balance(0, BONK_MINT, 0.0, 5, SIGNER),
-                ],
-                "postTokenBalances": [
-                    _make_token_balance(0, USDC_MINT, 0.0, 6, SIGNER),
-                    _make_token_balance(0, BONK_MINT, 50000.0, 5, SIGNER),
-                ],
-            },
-        }
+        raw = _make_raw(
+            _tx(_SIGNER_KEY, {"pubkey": "other_account", "signer": False}, _JUPITER_KEY),
+            preBalances=(1_000_000_000, 0, 0),
+            postBalances=(999_995_000, 0, 0),
+            preTokenBalances=(
+                _make_token_balance(0, USDC_MINT, 100.0, 6, SIGNER),
+                _make_token_balance(0, BONK_MINT, 0.0, 5, SIGNER),
+            ),
+            postTokenBalances=(
+                _make_token_balance(0, USDC_MINT, 0.0, 6, SIGNER),
+                _make_token_balance(0, BONK_MINT, 50000.0, 5, SIGNER),
+            ),
+        )
         actions = classify_solana_actions(raw)
         assert actions[0].type == "swap"
         assert actions[0].protocol == "Jupiter"
@@ -58,28 +78,16 @@ class TestSwapClassification:
 
     def test_swap_sol_for_token(self):
         """User loses SOL (beyond fee), gains USDC → swap."""
-        raw = {
-            "transaction": {
-                "message": {
-                    "accountKeys": [
-                        {"pubkey": SIGNER, "signer": True},
-                    ],
-                    "instructions": [],
-                },
-            },
-            "meta": {
-                "fee": 5000,
-                "err": None,
-                "preBalances": [2_000_000_000, 0],
-                "postBalances": [1_000_000_000, 0],
-                "preTokenBalances": [
-                    _make_token_balance(0, USDC_MINT, 0.0, 6, SIGNER),
-                ],
-                "postTokenBalances": [
-                    _make_token_balance(0, USDC_MINT, 50.0, 6, SIGNER),
-                ],
-            },
-        }
+        raw = _make_raw(
+            preBalances=(2_000_000_000, 0),
+            postBalances=(1_000_000_000, 0),
+            preTokenBalances=(
+                _make_token_balance(0, USDC_MINT, 0.0, 6, SIGNER),
+            ),
+            postTokenBalances=(
+                _make_token_balance(0, USDC_MINT, 50.0, 6, SIGNER),
+            ),
+        )
         actions = classify_solana_actions(raw)
         assert actions[0].type == "swap"
         assert actions[0].token_in.address == "native"  # SOL
@@ -89,57 +97,47 @@ class TestSwapClassification:
 class TestTransferClassification:
     def test_token_send(self):
         """User sends USDC, no incoming → transfer."""
-        raw = {
-            "transaction": {
-                "message": {
-                    "accountKeys": [
-                        {"pubkey": SIGNER, "signer": True},
-                    ],
-                    "instructions": [],
-                },
-            },
-            "meta": {
-                "fee": 5000,
-                "err": None,
-                "preBalances": [1_000_000_000],
-                "postBalances": [999_995_000],
-                "preTokenBalances": [
-                    _make_token_balance(0, USDC_MINT, 100.0, 6, SIGNER),
-                ],
-                "postTokenBalances": [
-                    _make_token_balance(0, USDC_MINT, 50.0, 6, SIGNER),
-                ],
-            },
-        }
+        raw = _make_raw(
+            preTokenBalances=(
+                _make_token_balance(0, USDC_MINT, 100.0, 6, SIGNER),
+            ),
+            postTokenBalances=(
+                _make_token_balance(0, USDC_MINT, 50.0, 6, SIGNER),
+            ),
+        )
         actions = classify_solana_actions(raw)
         assert actions[0].type == "transfer"
         assert actions[0].token_in.address == USDC_MINT
         assert float(actions[0].token_in.amount) == 50.0
 
+    def test_large_balance_delta_is_exact(self):
+        """Deltas come from raw base units, so large balances don't lose precision."""
+        def balance(amount: str) -> dict:
+            return {
+                "accountIndex": 0,
+                "mint": BONK_MINT,
+                "owner": SIGNER,
+                "uiTokenAmount": {"uiAmount": int(amount) / 1e9, "decimals": 9, "amount": amount},
+            }
+
+        raw = _make_raw(
+            preTokenBalances=(balance("123456789123456789"),),
+            postTokenBalances=(balance("123456789000000000"),),
+        )
+        actions = classify_solana_actions(raw)
+        assert actions[0].type == "transfer"
+        assert actions[0].token_in.amount == "0.123456789"
+
     def test_token_receive(self):
         """User receives USDC → transfer (received)."""
-        raw = {
-            "transaction": {
-                "message": {
-                    "accountKeys": [
-                        {"pubkey": SIGNER, "signer": True},
-                    ],
-                    "instructions": [],
-                },
-            },
-            "meta": {
-                "fee": 5000,
-                "err": None,
-                "preBalances": [1_000_000_000],
-                "postBalances": [999_995_000],
-                "preTokenBalances": [
-                    _make_token_balance(0, USDC_MINT, 0.0, 6, SIGNER),
-                ],
-                "postTokenBalances": [
-                    _make_token_balance(0, USDC_MINT, 25.0, 6, SIGNER),
-                ],
-            },
-        }
+        raw = _make_raw(
+            preTokenBalances=(
+                _make_token_balance(0, USDC_MINT, 0.0, 6, SIGNER),
+            ),
+            postTokenBalances=(
+                _make_token_balance(0, USDC_MINT, 25.0, 6, SIGNER),
+            ),
+        )
         actions = classify_solana_actions(raw)
         assert actions[0].type == "transfer"
         assert actions[0].token_out.address == USDC_MINT
@@ -149,75 +147,26 @@ class TestNFTClassification:
     def test_nft_transfer_detected(self):
         """SPL transfer with decimals=0 and amount=1 → nft_transfer."""
         nft_mint = "NFTmint1111111111111111111111111111111111111"
-        raw = {
-            "transaction": {
-                "message": {
-                    "accountKeys": [
-                        {"pubkey": SIGNER, "signer": True},
-                    ],
-                    "instructions": [],
-                },
-            },
-            "meta": {
-                "fee": 5000,
-                "err": None,
-                "preBalances": [1_000_000_000],
-                "postBalances": [999_995_000],
-                "preTokenBalances": [
-                    _make_token_balance(0, nft_mint, 0.0, 0, SIGNER),
-                ],
-                "postTokenBalances": [
-                    _make_token_balance(0, nft_mint, 1.0, 0, SIGNER),
-                ],
-            },
-        }
+        raw = _make_raw(
+            preTokenBalances=(
+                _make_token_balance(0, nft_mint, 0.0, 0, SIGNER),
+            ),
+            postTokenBalances=(
+                _make_token_balance(0, nft_mint, 1.0, 0, SIGNER),
+            ),
+        )
         actions = classify_solana_actions(raw)
         assert any(a.type == "nft_transfer" for a in actions)
 
 
 class TestProtocolLabeling:
     def test_jupiter_detected(self):
-        raw = {
-            "transaction": {
-                "message": {
-                    "accountKeys": [
-                        {"pubkey": SIGNER, "signer": True},
-                        {"pubkey": JUPITER_PROGRAM, "signer": False},
-                    ],
-                    "instructions": [],
-                },
-            },
-            "meta": {
-                "fee": 5000,
-                "err": None,
-                "preBalances": [1_000_000_000, 0],
-                "postBalances": [999_995_000, 0],
-                "preTokenBalances": [],
-                "postTokenBalances": [],
-            },
-        }
+        raw = _make_raw(_TX_WITH_JUPITER, preBalances=(1_000_000_000, 0), postBalances=(999_995_000, 0))
         actions = classify_solana_actions(raw)
         assert actions[0].protocol == "Jupiter"
 
     def test_no_known_program(self):
-        raw = {
-            "transaction": {
-                "message": {
-                    "accountKeys": [
-                        {"pubkey": SIGNER, "signer": True},
-                    ],
-                    "instructions": [],
-                },
-            },
-            "meta": {
-                "fee": 5000,
-                "err": None,
-                "preBalances": [1_000_000_000],
-                "postBalances": [999_995_000],
-                "preTokenBalances": [],
-                "postTokenBalances": [],
-            },
-        }
+        raw = _make_raw()
         actions = classify_solana_actions(raw)
         assert actions[0].protocol is None
 
@@ -225,24 +174,7 @@ class TestProtocolLabeling:
 class TestFallbackClassification:
     def test_no_deltas(self):
         """No meaningful balance changes → contract_call."""
-        raw = {
-            "transaction": {
-                "message": {
-                    "accountKeys": [
-                        {"pubkey": SIGNER, "signer": True},
-                    ],
-                    "instructions": [],
-                },
-            },
-            "meta": {
-                "fee": 5000,
-                "err": None,
-                "preBalances": [1_000_000_000],
-                "postBalances": [999_995_000],
-                "preTokenBalances": [],
-                "postTokenBalances": [],
-            },
-        }
+        raw = _make_raw()
         actions = classify_solana_actions(raw)
         assert actions[0].type == "contract_call"
 
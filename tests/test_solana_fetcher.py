@@ -1,24 +1,29 @@
 import httpx
 import pytest
-import respx
 from fastapi import HTTPException
 
 from app.config import settings
 from app.fetchers.solana_fetcher import fetch_solana_transaction
 from tests.conftest import (
-    MOCK_SOLANA_TX,
-    MOCK_SOLANA_TX_FAILED,
-    MOCK_SOLANA_TX_NULL,
-    MOCK_SOLANA_TX_NULL_BLOCKTIME,
+    RESP_SOLANA_TX,
+    RESP_SOLANA_TX_FAILED,
+    RESP_SOLANA_TX_NULL,
+    RESP_SOLANA_TX_NULL_BLOCKTIME,
 )
 
+# One event loop for the whole module instead of one per test
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
 SIGNATURE = "5" * 88  # placeholder
 
 
-@respx.mock
-async def test_confirmed_transaction():
-    url = settings.solana_rpc_url
-    respx.post(url).mock(return_value=httpx.Response(200, json=MOCK_SOLANA_TX))
+@pytest.fixture
+def solana_rpc(respx_mock):
+    return respx_mock.post(settings.solana_rpc_url)
+
+
+async def test_confirmed_transaction(solana_rpc):
+    solana_rpc.mock(return_value=RESP_SOLANA_TX)
 
     result = await fetch_solana_transaction(SIGNATURE)
 
@@ -32,39 +37,31 @@ async def test_confirmed_transaction():
     assert result.block_time is not None
 
 
-@respx.mock
-async def test_failed_transaction():
-    url = settings.solana_rpc_url
-    respx.post(url).mock(return_value=httpx.Response(200, json=MOCK_SOLANA_TX_FAILED))
+async def test_failed_transaction(solana_rpc):
+    solana_rpc.mock(return_value=RESP_SOLANA_TX_FAILED)
 
     result = await fetch_solana_transaction(SIGNATURE)
     assert result.status == "failed"
 
 
-@respx.mock
-async def test_null_blocktime():
-    url = settings.solana_rpc_url
-    respx.post(url).mock(return_value=httpx.Response(200, json=MOCK_SOLANA_TX_NULL_BLOCKTIME))
+async def test_null_blocktime(solana_rpc):
+    solana_rpc.mock(return_value=RESP_SOLANA_TX_NULL_BLOCKTIME)
 
     result = await fetch_solana_transaction(SIGNATURE)
     assert result.status == "confirmed"
     assert result.block_time is None
 
 
-@respx.mock
-async def test_not_found():
-    url = settings.solana_rpc_url
-    respx.post(url).mock(return_value=httpx.Response(200, json=MOCK_SOLANA_TX_NULL))
+async def test_not_found(solana_rpc):
+    solana_rpc.mock(return_value=RESP_SOLANA_TX_NULL)
 
     with pytest.raises(HTTPException) as exc_info:
         await fetch_solana_transaction(SIGNATURE)
     assert exc_info.value.status_code == 404
 
 
-@respx.mock
-async def test_timeout():
-    url = settings.solana_rpc_url
-    respx.post(url).mock(side_effect=httpx.TimeoutException("timeout"))
+async def test_timeout(solana_rpc):
+    solana_rpc.mock(side_effect=httpx.TimeoutException("timeout"))
 
     with pytest.raises(HTTPException) as exc_info:
         await fetch_solana_transaction(SIGNATURE)
@@ -2,7 +2,6 @@
 
 import httpx
 import pytest
-import respx
 
 from app.config import settings
 from app.tokens.resolver import (
@@ -12,6 +11,34 @@ from app.tokens.resolver import (
     resolve_token_sync,
 )
 
+# ABI-encoded eth_call results: offset word, length word, then the padded bytes
+_OFFSET_WORD = "0000000000000000000000000000000000000000000000000000000000000020"
+TEST_SYMBOL_HEX = (
+    "0x"
+    + _OFFSET_WORD
+    + "0000000000000000000000000000000000000000000000000000000000000004"  # length
+    + "5445535400000000000000000000000000000000000000000000000000000000"  # "TEST"
+)
+TEST_NAME_HEX = (
+    "0x"
+    + _OFFSET_WORD
+    + "000000000000000000000000000000000000000000000000000000000000000a"  # length=10
+    + "5465737420546f6b656e00000000000000000000000000000000000000000000"  # "Test Token"
+)
+DECIMALS_18_HEX = "0x0000000000000000000000000000000000000000000000000000000000000012"
+# Batch reply for symbol()/name()/decimals(), deliberately out of id order
+TEST_METADATA_BATCH = [
+    {"jsonrpc": "2.0", "id": 3, "result": DECIMALS_18_HEX},
+    {"jsonrpc": "2.0", "id": 1, "result": TEST_SYMBOL_HEX},
+    {"jsonrpc": "2.0", "id": 2, "result": TEST_NAME_HEX},
+]
+USDC_SYMBOL_HEX = (
+    "0x"
+    + _OFFSET_WORD
+    + "0000000000000000000000000000000000000000000000000000000000000004"
+    + "5553444300000000000000000000000000000000000000000000000000000000"  # "USDC"
+)
+
 
 class TestRegistryLookup:
     def test_base_usdc(self):
@@ -62,6 +89,8 @@ class TestUnknownToken:
         assert result["decimals"] == 9
 
 
+# Async classes share one module-wide event loop instead of one per test
+@pytest.mark.asyncio(loop_scope="module")
 class TestAsyncResolver:
     @pytest.fixture(autouse=True)
     def clear_resolver_cache(self):
@@ -79,13 +108,14 @@ class TestAsyncResolver:
         assert result1["name"] == "Unknown Token"
 
         # Should be cached now
-        cache_key = f"base:{addr}"
+        cache_key = ("base", addr)
         assert cache_key in _cache
 
         result2 = await resolve_token("base", addr)
         assert result2 == result1
 
 
+@pytest.mark.asyncio(loop_scope="module")
 class TestOnChainFallback:
     """Test the actual on-chain resolution paths with mocked HTTP."""
 
@@ -95,62 +125,40 @@ class TestOnChainFallback:
         yield
         _cache.clear()
 
-    @respx.mock
-    async def test_evm_onchain_resolution_success(self):
-        """Mock eth_call responses for symbol(), name(), decimals()."""
+    async def test_evm_onchain_resolution_success(self, respx_mock):
+        """Mock one batched eth_call reply for symbol(), name(), decimals()."""
         addr = "0x" + "ee" * 20  # not in registry
         url = settings.base_rpc_url
 
-        # ABI-encode "TEST" as string: offset(32) + length(32) + data(32)
-        # offset = 0x20, length = 4, data = "TEST" padded
-        symbol_hex = (
-            "0x"
-            + "0000000000000000000000000000000000000000000000000000000000000020"  # offset
-            + "0000000000000000000000000000000000000000000000000000000000000004"  # length
-            + "5445535400000000000000000000000000000000000000000000000000000000"  # "TEST"
-        )
-        name_hex = (
-            "0x"
-            + "0000000000000000000000000000000000000000000000000000000000000020"
-            + "000000000000000000000000000000000000000000000000000000000000000a"  # length=10
-            + "5465737420546f6b656e00000000000000000000000000000000000000000000"  # "Test Token"
-        )
-        decimals_hex = "0x0000000000000000000000000000000000000000000000000000000000000012"  # 18
-
-        respx.post(url).side_effect = [
-            httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": symbol_hex}),
-            httpx.Response(200, json={"jsonrpc": "2.0", "id": 2, "result": name_hex}),
-            httpx.Response(200, json={"jsonrpc": "2.0", "id": 3, "result": decimals_hex}),
-        ]
+        route = respx_mock.post(url).mock(return_value=httpx.Response(200, json=TEST_METADATA_BATCH))
 
         result = await resolve_token("base", addr)
         assert result["symbol"] == "TEST"
         assert result["name"] == "Test Token"
         assert result["decimals"] == 18
+        assert route.call_count == 1
 
         # Verify it's cached
-        cache_key = f"base:{addr}"
+        cache_key = ("base", addr)
         assert cache_key in _cache
 
-    @respx.mock
-    async def test_evm_onchain_timeout_falls_back(self):
+    async def test_evm_onchain_timeout_falls_back(self, respx_mock):
         """On-chain call timeout should return fallback, not crash."""
         addr = "0x" + "dd" * 20
         url = settings.base_rpc_url
 
-        respx.post(url).mock(side_effect=httpx.TimeoutException("timeout"))
+        respx_mock.post(url).mock(side_effect=httpx.TimeoutException("timeout"))
 
         result = await resolve_token("base", addr)
         assert result["name"] == "Unknown Token"
         assert "..." in result["symbol"]
 
-    @respx.mock
-    async def test_solana_onchain_resolution_success(self):
+    async def test_solana_onchain_resolution_success(self, respx_mock):
         """Mock getAccountInfo for SPL token metadata."""
         mint = "SomeNewMint1111111111111111111111111111111111"
         url = settings.solana_rpc_url
 
-        respx.post(url).mock(return_value=httpx.Response(200, json={
+        respx_mock.post(url).mock(return_value=httpx.Response(200, json={
             "jsonrpc": "2.0",
             "id": 1,
             "result": {
@@ -170,13 +178,12 @@ class TestOnChainFallback:
         assert result["decimals"] == 8
         assert result["name"] == "SPL Token"
 
-    @respx.mock
-    async def test_solana_onchain_timeout_falls_back(self):
+    async def test_solana_onchain_timeout_falls_back(self, respx_mock):
         """Solana RPC timeout should return fallback."""
         mint = "AnotherMint11111111111111111111111111111111111"
         url = settings.solana_rpc_url
 
-        respx.post(url).mock(side_effect=httpx.TimeoutException("timeout"))
+        respx_mock.post(url).mock(side_effect=httpx.TimeoutException("timeout"))
 
         result = await resolve_token("solana", mint)
         assert result["name"] == "Unknown Token"
@@ -187,15 +194,21 @@ class TestDecodeStringResult:
     """Test the ABI string decoder directly."""
 
     def test_valid_string(self):
-        # ABI-encode "USDC"
+        assert _decode_string_result(USDC_SYMBOL_HEX) == "USDC"
+
+    def test_follows_head_offset(self):
+        # Same string behind a 0x40 offset with a padding word in between
         hex_data = (
             "0x"
-            + "0000000000000000000000000000000000000000000000000000000000000020"
-            + "0000000000000000000000000000000000000000000000000000000000000004"
-            + "5553444300000000000000000000000000000000000000000000000000000000"
+            + "0000000000000000000000000000000000000000000000000000000000000040"
+            + "00" * 32
+            + USDC_SYMBOL_HEX[2 + 64:]
         )
         assert _decode_string_result(hex_data) == "USDC"
 
+    def test_offset_past_end(self):
+        assert _decode_string_result("0x" + "ff" * 32 + "00" * 32) == ""
+
     def test_empty_result(self):
         assert _decode_string_result("0x") == ""
         assert _decode_string_result("") == ""
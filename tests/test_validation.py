@@ -1,8 +1,13 @@
+import base58
 import pytest
 from fastapi import HTTPException
 
 from app.validation.input import validate_chain, validate_tx_hash
 
+# Encoded once; base58 encoding is a pure-Python big-int loop
+VALID_SIG = base58.b58encode(b"\x01" * 64).decode()
+SHORT_SIG = base58.b58encode(b"\x01" * 32).decode()
+
 
 class TestValidateChain:
     def test_valid_base(self):
@@ -55,6 +60,14 @@ class TestValidateTxHashBase:
         with pytest.raises(HTTPException):
             validate_tx_hash("base", "0x" + "zz" * 32)
 
+    def test_embedded_whitespace(self):
+        with pytest.raises(HTTPException):
+            validate_tx_hash("base", "0x" + "ab" * 31 + " a")
+
+    def test_uppercase_prefix(self):
+        with pytest.raises(HTTPException):
+            validate_tx_hash("base", "0X" + "ab" * 32)
+
     def test_empty_string(self):
         with pytest.raises(HTTPException):
             validate_tx_hash("base", "")
@@ -62,9 +75,7 @@ class TestValidateTxHashBase:
 
 class TestValidateTxHashSolana:
     def test_valid_signature(self):
-        import base58
-        sig = base58.b58encode(b"\x01" * 64).decode()
-        assert validate_tx_hash("solana", sig) == sig
+        assert validate_tx_hash("solana", VALID_SIG) == VALID_SIG
 
     def test_invalid_base58(self):
         with pytest.raises(HTTPException) as exc_info:
@@ -73,10 +84,8 @@ class TestValidateTxHashSolana:
         # Just ensure it doesn't crash unexpectedly
 
     def test_wrong_length(self):
-        import base58
-        short_sig = base58.b58encode(b"\x01" * 32).decode()
         with pytest.raises(HTTPException) as exc_info:
-            validate_tx_hash("solana", short_sig)
+            validate_tx_hash("solana", SHORT_SIG)
         assert exc_info.value.status_code == 400
         assert "64 bytes" in exc_info.value.detail
 